@@ -0,0 +1,116 @@
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from judiciary_platform.caching import generation_state, get_cache, invalidate, is_shared_cache, make_key, within_replica_lag
+from judiciary_platform.db_router import set_request_user
+
+from .models import CustomUser
+
+# Fields kept in the cached principal; everything else is loaded on first use
+PRINCIPAL_FIELDS = ['id', 'role', 'is_active', 'is_staff', 'is_superuser']
+
+PRINCIPAL_NAMESPACE = 'auth_principal'
+
+
+def principal_ttl() -> int:
+    # Bounded by the access token lifetime: nothing outlives the tokens using it
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def invalidate_principal(user_id):
+    """Bump the user's principal version stamp (see accounts.signals)"""
+    invalidate(PRINCIPAL_NAMESPACE, user_id)
+
+
+def load_principal(user_id):
+    """
+    Return the principal dict for a user id, or None if the user does not exist.
+    
+    Cached only in a shared cache: with a per-process one (locmem, dummy) the
+    version bump of a deactivation or role change would only reach the
+    process that made it, and the others would keep the old flags for the
+    whole TTL. There every request reads the row.
+    """
+    shared = is_shared_cache()
+    if shared:
+        cache = get_cache()
+        generations, bumped_at = generation_state(PRINCIPAL_NAMESPACE, user_id)
+        key = make_key(PRINCIPAL_NAMESPACE, user_id, generations=generations)
+        principal = cache.get(key)
+        if principal is not None:
+            return principal
+
+    fields = list(PRINCIPAL_FIELDS)
+    if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+        fields.append('password')
+    row = CustomUser.objects.filter(
+        **{api_settings.USER_ID_FIELD: user_id}
+    ).values(*fields).first()
+    if row is None:
+        return None
+
+    if 'password' in row:
+        # Only reachable on simplejwt versions that have CHECK_REVOKE_TOKEN
+        from rest_framework_simplejwt.utils import get_md5_hash_password
+        row['password_hash'] = get_md5_hash_password(row.pop('password'))
+    if shared and not within_replica_lag(bumped_at):
+        cache.set(key, row, principal_ttl())
+    return row
+
+
+def user_from_principal(principal) -> CustomUser:
+    """
+    Build a CustomUser from the principal without a query.
+
+    Fields outside PRINCIPAL_FIELDS are deferred; touching any of them loads
+    all of them in one query (see CustomUser.refresh_from_db).
+    """
+    # from_db() consumes values in concrete field order
+    field_names = [
+        field.attname for field in CustomUser._meta.concrete_fields
+        if field.attname in PRINCIPAL_FIELDS
+    ]
+    user = CustomUser.from_db(
+        router.db_for_read(CustomUser), field_names, [principal[name] for name in field_names]
+    )
+    user._principal_only = True
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a cached principal.
+
+    The principal (id, role and the active/staff/superuser flags) is keyed by
+    user id plus a version stamp that every CustomUser save bumps, so role
+    checks such as `request.user.role != 'admin'` need no database query.
+    With a per-process cache the principal is read per request instead
+    (see load_principal).
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Before the lookup: a just-registered user may not be on the replicas yet
+        set_request_user(user_id)
+        principal = load_principal(user_id)
+        if principal is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not principal['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if 'password_hash' in principal and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != principal['password_hash']:
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user_from_principal(principal)
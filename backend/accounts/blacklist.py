@@ -0,0 +1,211 @@
+"""
+In-memory Bloom filter in front of simplejwt's token blacklist.
+
+Refresh and logout verify that a refresh token is not blacklisted. Nearly
+all tokens are not, so the filter answers "definitely not blacklisted"
+without a query; only filter hits (real or false positives) reach the
+database. The filter holds every blacklisted jti, so it has no false
+negatives as long as it is in sync:
+
+- BlacklistedToken saves bump a version stamp in the cache (accounts.signals);
+  a filter that sees a new stamp loads the rows added since its last sync.
+  Ids are allocated at insert but rows become visible at commit, so a row
+  can show up after a higher id was already loaded: each sync re-reads the
+  last SYNC_OVERLAP ids below the highest one seen.
+- Pruning bumps a generation stamp, which makes filters rebuild from scratch.
+- Filters also resync after TOKEN_BLACKLIST_FILTER_MAX_STALENESS seconds,
+  in case a stamp was evicted from the cache.
+
+The stamps only reach other processes through a shared cache (file, Redis).
+With a per-process cache (locmem, dummy) a token blacklisted by one process
+would pass the filter of every other one until its next resync, so there
+every check goes to the database instead.
+"""
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterable
+
+from django.conf import settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from judiciary_platform.caching import bump_counter, get_cache, is_shared_cache
+
+VERSION_KEY = 'token_blacklist:version'
+GENERATION_KEY = 'token_blacklist:generation'
+STATS_KEY_PREFIX = 'token_blacklist:stats:'
+
+# Incremental syncs re-read this many ids below the highest one loaded, for
+# rows committed after a row with a higher id
+SYNC_OVERLAP = 1000
+
+# Process counters are added to the shared totals every this many checks
+STATS_FLUSH_EVERY = 100
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one BLAKE2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hash_count)]
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def fill_ratio(self) -> float:
+        return sum(bin(byte).count('1') for byte in self.bits) / self.size
+
+    @property
+    def estimated_false_positive_rate(self) -> float:
+        return self.fill_ratio ** self.hash_count
+
+
+class TokenBlacklistFilter:
+    """
+    Process-wide blacklist filter, see the module docstring for consistency
+    """
+
+    def __init__(self, capacity: int = None, error_rate: float = None, max_staleness: float = None):
+        self.capacity = capacity or getattr(settings, 'TOKEN_BLACKLIST_FILTER_CAPACITY', 100000)
+        self.error_rate = error_rate or getattr(settings, 'TOKEN_BLACKLIST_FILTER_ERROR_RATE', 0.01)
+        self.max_staleness = (
+            max_staleness if max_staleness is not None
+            else getattr(settings, 'TOKEN_BLACKLIST_FILTER_MAX_STALENESS', 5.0)
+        )
+        self.bloom = None
+        self.last_id = 0
+        self.version = None
+        self.generation = None
+        self.synced_at = 0.0
+        self.stats = self._empty_stats()
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {'checks': 0, 'filter_negatives': 0, 'database_checks': 0, 'false_positives': 0, 'blacklisted': 0}
+
+    @staticmethod
+    def _load(bloom: BloomFilter, rows: Iterable, last_id: int) -> int:
+        """Add (id, jti) rows to `bloom`, returns the highest id seen"""
+        for row_id, jti in rows:
+            # Re-read overlap rows are already in; do not count them twice
+            if jti not in bloom:
+                bloom.add(jti)
+            last_id = max(last_id, row_id)
+        return last_id
+
+    def rebuild(self):
+        total = BlacklistedToken.objects.count()
+        bloom = BloomFilter(max(self.capacity, total * 2), self.error_rate)
+        rows = BlacklistedToken.objects.order_by('id').values_list('id', 'token__jti').iterator()
+        last_id = self._load(bloom, rows, 0)
+        # Readers do not take the lock: swap in the filter only once it is
+        # complete, never expose a partly loaded one
+        self.bloom, self.last_id = bloom, last_id
+
+    def sync(self):
+        """Bring the filter up to date with the blacklist table when it may have changed"""
+        stamps = get_cache().get_many([VERSION_KEY, GENERATION_KEY])
+        version, generation = stamps.get(VERSION_KEY, 0), stamps.get(GENERATION_KEY, 0)
+        stale = time.monotonic() - self.synced_at > self.max_staleness
+        if self.bloom is not None and not stale and (version, generation) == (self.version, self.generation):
+            return
+
+        with self._lock:
+            if self.bloom is None or generation != self.generation:
+                self.rebuild()
+            else:
+                rows = BlacklistedToken.objects.filter(
+                    id__gt=self.last_id - SYNC_OVERLAP
+                ).values_list('id', 'token__jti')
+                self.last_id = self._load(self.bloom, rows, self.last_id)
+                # Past capacity the false positive rate climbs; start over larger
+                if self.bloom.count > self.bloom.capacity:
+                    self.rebuild()
+            self.version, self.generation = version, generation
+            self.synced_at = time.monotonic()
+
+    def add(self, jti: str):
+        """Record a token blacklisted by this process (no need to wait for a resync)"""
+        if self.bloom is not None:
+            self.bloom.add(jti)
+
+    def is_blacklisted(self, jti: str) -> bool:
+        self._count('checks')
+        if not is_shared_cache():
+            # Blacklisting in other processes would go unseen, see the module docstring
+            self._count('database_checks')
+            blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if blacklisted:
+                self._count('blacklisted')
+            return blacklisted
+
+        self.sync()
+        if jti not in self.bloom:
+            self._count('filter_negatives')
+            return False
+
+        self._count('database_checks')
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        self._count('blacklisted' if blacklisted else 'false_positives')
+        return blacklisted
+
+    def _count(self, name: str):
+        self.stats[name] += 1
+        if name == 'checks':
+            self._unflushed += 1
+            if self._unflushed >= STATS_FLUSH_EVERY:
+                self.flush_stats()
+
+    def flush_stats(self):
+        """Add this process's counters to the shared totals read by `prune_token_blacklist --stats`"""
+        stats, self.stats = self.stats, self._empty_stats()
+        self._unflushed = 0
+        for name, value in stats.items():
+            if value:
+                bump_counter(STATS_KEY_PREFIX + name, value)
+
+
+def shared_stats() -> Dict[str, int]:
+    names = TokenBlacklistFilter._empty_stats()
+    found = get_cache().get_many([STATS_KEY_PREFIX + name for name in names])
+    return {name: found.get(STATS_KEY_PREFIX + name, 0) for name in names}
+
+
+def bump_version():
+    """A token was blacklisted: filters load the new rows on their next check"""
+    bump_counter(VERSION_KEY)
+
+
+def bump_generation():
+    """Rows were deleted: filters rebuild so pruned tokens stop matching"""
+    bump_counter(GENERATION_KEY)
+
+
+_filter = None
+
+
+def get_blacklist_filter() -> TokenBlacklistFilter:
+    global _filter
+    if _filter is None:
+        _filter = TokenBlacklistFilter()
+    return _filter
@@ -0,0 +1,164 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 costs tens to hundreds of milliseconds of CPU per call. Hashes run in
+a bounded thread pool (hashlib and the bcrypt/argon2 bindings release the
+GIL, so threads hash in parallel) whose size caps how many cores hashing
+may take. When more than PASSWORD_HASHING_MAX_QUEUE requests are already
+waiting, new ones are rejected with HashingOverloaded instead of queueing
+without bound.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import user_login_failed
+from django.contrib.auth.hashers import check_password, identify_hasher, get_hasher, make_password
+
+from .models import CustomUser
+
+logger = logging.getLogger('judiciary_platform.auth')
+
+
+class HashingOverloaded(Exception):
+    """The hashing queue is full; the client should retry later"""
+
+
+class PasswordHashingPool:
+    def __init__(self, max_workers: int = None, max_queue: int = None):
+        self.max_workers = max_workers or getattr(
+            settings, 'PASSWORD_HASHING_WORKERS', min(4, os.cpu_count() or 1)
+        )
+        self.max_queue = max_queue if max_queue is not None else getattr(
+            settings, 'PASSWORD_HASHING_MAX_QUEUE', 64
+        )
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self.pending = 0  # submitted, not finished (queued + running)
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_ms = 0.0
+        self.total_hash_ms = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self.pending - self.running
+
+    def submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                logger.warning('Password hashing queue full (%s waiting), rejecting request', self.queue_depth)
+                raise HashingOverloaded('Too many authentication requests, please retry shortly')
+            self.pending += 1
+        future = self.executor.submit(self._run, time.perf_counter(), fn, args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _run(self, submitted_at: float, fn, args):
+        started_at = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self.total_wait_ms += (started_at - submitted_at) * 1000
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.total_hash_ms += (time.perf_counter() - started_at) * 1000
+
+    def _done(self, future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+
+    def run(self, fn, *args):
+        """Blocking call for sync views"""
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self.pending - self.running,
+                'running': self.running,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self.total_wait_ms / completed, 2),
+                'avg_hash_ms': round(self.total_hash_ms / completed, 2),
+            }
+
+
+_pool = None
+
+
+def get_hashing_pool() -> PasswordHashingPool:
+    global _pool
+    if _pool is None:
+        _pool = PasswordHashingPool()
+    return _pool
+
+
+async def ahash_password(password: str) -> str:
+    return await get_hashing_pool().arun(make_password, password)
+
+
+async def averify_password(password: str, encoded: str) -> bool:
+    return await get_hashing_pool().arun(check_password, password, encoded)
+
+
+def _needs_rehash(encoded: str) -> bool:
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != get_hasher().algorithm or hasher.must_update(encoded)
+
+
+def _get_login_user(email):
+    try:
+        return CustomUser._default_manager.get_by_natural_key(email)
+    except CustomUser.DoesNotExist:
+        return None
+
+
+def _login_failed(request, email):
+    user_login_failed.send(sender=__name__, credentials={'username': email}, request=request)
+
+
+async def aauthenticate(request, email: str, password: str):
+    """
+    ModelBackend.authenticate with the hash check awaited on the pool.
+
+    The lookup and any hash upgrade stay on Django's sync thread; only the
+    hashing moves. Unknown emails still pay for one hash so they cannot be
+    told apart by timing.
+    """
+    user = await sync_to_async(_get_login_user)(email)
+    if user is None:
+        await ahash_password(password)
+        await sync_to_async(_login_failed)(request, email)
+        return None
+
+    if not await averify_password(password, user.password) or not user.is_active:
+        await sync_to_async(_login_failed)(request, email)
+        return None
+
+    if _needs_rehash(user.password):
+        user.password = await ahash_password(password)
+        await sync_to_async(user.save)(update_fields=['password'])
+
+    user.backend = 'django.contrib.auth.backends.ModelBackend'
+    return user
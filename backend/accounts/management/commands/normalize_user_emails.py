@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Lower, Trim
+
+from accounts.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Lowercase stored user emails (logins and the case-insensitive unique '
+        'constraint expect them normalized) and report addresses shared by '
+        'several accounts in different case, which are left unchanged. '
+        'Migration accounts.0002 does the same and stops on such collisions; '
+        'run this first to list them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report what would change'
+        )
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.annotate(normalized=Lower(Trim('email')))
+        collisions = list(
+            users.values('normalized').annotate(accounts=Count('id')).filter(accounts__gt=1)
+            .values_list('normalized', flat=True)
+        )
+        pending = users.exclude(email=F('normalized')).exclude(normalized__in=collisions)
+
+        if options['dry_run']:
+            self.stdout.write(f'Would normalize {pending.count()} email(s)')
+        else:
+            with transaction.atomic():
+                updated = CustomUser.objects.filter(
+                    pk__in=list(pending.values_list('pk', flat=True))
+                ).update(email=Lower(Trim('email')))
+            self.stdout.write(f'Normalized {updated} email(s)')
+
+        if not collisions:
+            self.stdout.write(self.style.SUCCESS('No email collisions'))
+            return
+
+        for normalized in collisions:
+            accounts = users.filter(normalized=normalized).order_by('id')
+            listing = ', '.join(
+                f'#{pk} {email} (last login {last_login or "never"})'
+                for pk, email, last_login in accounts.values_list('id', 'email', 'last_login')
+            )
+            self.stdout.write(self.style.WARNING(f'{normalized}: {listing}'))
+        raise CommandError(
+            f'{len(collisions)} email(s) belong to several accounts; merge or rename '
+            'the duplicates, then run this command again'
+        )
@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.blacklist import BloomFilter, bump_generation, get_blacklist_filter, shared_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired outstanding and blacklisted refresh tokens in batches '
+        'and report blacklist table and filter stats. Safe to run from cron.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Outstanding tokens deleted per transaction'
+        )
+        parser.add_argument(
+            '--pause', type=float, default=0.0,
+            help='Seconds to sleep between batches to limit database load'
+        )
+        parser.add_argument(
+            '--grace-hours', type=float, default=0.0,
+            help='Keep tokens that expired less than this many hours ago'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count what would be deleted'
+        )
+        parser.add_argument(
+            '--stats', action='store_true',
+            help='Only report stats, do not delete anything'
+        )
+    
+    def handle(self, *args, **options):
+        if not options['stats']:
+            self.prune(options)
+        self.report()
+    
+    def prune(self, options):
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        expired = OutstandingToken.objects.filter(expires_at__lt=cutoff)
+        
+        if options['dry_run']:
+            self.stdout.write(
+                f"Would delete {expired.count()} outstanding token(s), "
+                f"{BlacklistedToken.objects.filter(token__expires_at__lt=cutoff).count()} blacklisted"
+            )
+            return
+        
+        deleted_outstanding = deleted_blacklisted = 0
+        while True:
+            ids = list(expired.order_by('id').values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            deleted_blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+            deleted_outstanding += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+            if options['pause']:
+                time.sleep(options['pause'])
+        
+        if deleted_blacklisted:
+            # Pruned jtis would otherwise linger in every process's filter
+            bump_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted_outstanding} outstanding and {deleted_blacklisted} blacklisted token(s)'
+        ))
+    
+    def report(self):
+        now = timezone.now()
+        outstanding = OutstandingToken.objects.count()
+        blacklisted = BlacklistedToken.objects.count()
+        expired = OutstandingToken.objects.filter(expires_at__lt=now).count()
+        self.stdout.write(f'Outstanding tokens: {outstanding} ({expired} expired)')
+        self.stdout.write(f'Blacklisted tokens: {blacklisted}')
+        
+        blacklist_filter = get_blacklist_filter()
+        blacklist_filter.rebuild()
+        bloom: BloomFilter = blacklist_filter.bloom
+        self.stdout.write(
+            f'Filter: {bloom.size} bits, {bloom.hash_count} hashes, fill {bloom.fill_ratio:.2%}, '
+            f'estimated false positive rate {bloom.estimated_false_positive_rate:.4%}'
+        )
+        
+        stats = shared_stats()
+        checks = stats['checks']
+        if checks:
+            self.stdout.write(
+                f"Checks: {checks}, answered by filter {stats['filter_negatives'] / checks:.1%}, "
+                f"database checks {stats['database_checks']} "
+                f"({stats['false_positives']} false positive(s), {stats['blacklisted']} blacklisted)"
+            )
+        else:
+            self.stdout.write('Checks: none recorded yet')
@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count, F
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_user_emails(apps, schema_editor):
+    """Lowercase stored emails so logins can look them up exactly (CustomUserManager)"""
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    users = CustomUser.objects.annotate(normalized=Lower(Trim('email')))
+    collisions = list(
+        users.values('normalized').annotate(accounts=Count('id')).filter(accounts__gt=1)
+        .values_list('normalized', flat=True)
+    )
+    if collisions:
+        raise RuntimeError(
+            f"{len(collisions)} email(s) belong to several accounts in different case "
+            f"({', '.join(collisions[:10])}). List them with "
+            "`manage.py normalize_user_emails --dry-run`, merge or rename the "
+            "duplicates, then migrate again"
+        )
+    users.exclude(email=F('normalized')).update(email=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_user_emails, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,24 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models.functions import Lower
+
+
+class CustomUserManager(UserManager):
+    """
+    Emails are stored lowercased, so logins and uniqueness checks are
+    case-insensitive plain lookups on the unique email index.
+    
+    Rows written before that are lowercased by migration 0002, which stops
+    on addresses shared by several accounts in different case; resolve
+    those with `manage.py normalize_user_emails` first.
+    """
+    
+    @classmethod
+    def normalize_email(cls, email):
+        return (email or '').strip().lower()
+    
+    def get_by_natural_key(self, email):
+        return self.get(email=self.normalize_email(email))
 
 
 class CustomUser(AbstractUser):
@@ -21,6 +40,8 @@ class CustomUser(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CustomUserManager()
+    
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
     
@@ -28,10 +49,30 @@ class CustomUser(AbstractUser):
         db_table = 'accounts_customuser'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        constraints = [
+            # Backstop for writes that skip save() (bulk_create, update()),
+            # added by migration 0003 once 0002 has lowercased every email
+            models.UniqueConstraint(Lower('email'), name='accounts_customuser_email_ci_unique'),
+        ]
     
     def __str__(self):
         return f"{self.email} ({self.get_role_display()})"
     
+    def refresh_from_db(self, using=None, fields=None):
+        # Users built from a cached auth principal (accounts.authentication)
+        # load every deferred field at once instead of one query per field
+        if fields is not None and getattr(self, '_principal_only', False):
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields)
+    
+    def save(self, *args, **kwargs):
+        # Deferred fields would be skipped by save() (auto_now updated_at too)
+        if getattr(self, '_principal_only', False) and self.get_deferred_fields():
+            self.refresh_from_db(fields=list(self.get_deferred_fields()))
+        if 'email' not in self.get_deferred_fields():
+            self.email = CustomUser.objects.normalize_email(self.email)
+        super().save(*args, **kwargs)
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -1,14 +1,51 @@
 from rest_framework import serializers
+from judiciary_platform.fieldsets import SparseFieldsetMixin
+from judiciary_platform.metrics import TimedSerializerMixin
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from .models import CustomUser
 
 
-class UserSerializer(serializers.ModelSerializer):
+def find_conflicts(email, username, exclude_pk=None):
+    """
+    Return which of email/username are taken, in one query
+    (`email` normalized with CustomUser.objects.normalize_email)
+    """
+    match = Q()
+    if email is not None:
+        match |= Q(email=email)
+    if username is not None:
+        match |= Q(username=username)
+    queryset = CustomUser.objects.filter(match)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    conflicts = set()
+    for taken_email, taken_username in queryset.values_list('email', 'username')[:2]:
+        if email is not None and taken_email == email:
+            conflicts.add('email')
+        if taken_username == username:
+            conflicts.add('username')
+    return conflicts
+
+
+def conflict_error(conflicts):
+    # Same messages as the former per-field checks; email is reported first
+    if 'email' in conflicts:
+        return serializers.ValidationError("User with this email already exists")
+    return serializers.ValidationError("User with this username already exists")
+
+
+class UserSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for user profile data
     """
     full_name = serializers.ReadOnlyField()
     
+    FIELD_COLUMNS = {
+        'full_name': ('first_name', 'last_name'),
+    }
+    
     class Meta:
         model = CustomUser
         fields = [
@@ -17,6 +54,15 @@ class UserSerializer(serializers.ModelSerializer):
             'profile_picture', 'is_verified', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'is_verified']
+        # Replaced by the case-insensitive check in validate_email
+        extra_kwargs = {'email': {'validators': []}}
+    
+    def validate_email(self, value):
+        value = CustomUser.objects.normalize_email(value)
+        exclude_pk = self.instance.pk if self.instance is not None else None
+        if 'email' in find_conflicts(value, None, exclude_pk):
+            raise serializers.ValidationError("User with this email already exists")
+        return value
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -32,6 +78,14 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'username', 'email', 'first_name', 'last_name', 
             'password', 'password_confirm', 'role', 'phone_number'
         ]
+        # Uniqueness is checked once in validate() and enforced by the insert
+        extra_kwargs = {
+            'email': {'validators': []},
+            'username': {'validators': [CustomUser.username_validator]},
+        }
+    
+    def validate_email(self, value):
+        return CustomUser.objects.normalize_email(value)
     
     def validate(self, attrs):
         """
@@ -43,25 +97,53 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         if password != password_confirm:
             raise serializers.ValidationError("Passwords do not match")
         
-        # Validate email uniqueness
-        email = attrs.get('email')
-        if CustomUser.objects.filter(email=email).exists():
-            raise serializers.ValidationError("User with this email already exists")
-        
-        # Validate username uniqueness
-        username = attrs.get('username')
-        if CustomUser.objects.filter(username=username).exists():
-            raise serializers.ValidationError("User with this username already exists")
+        # Email and username uniqueness in a single query
+        conflicts = find_conflicts(attrs.get('email'), attrs.get('username'))
+        if conflicts:
+            raise conflict_error(conflicts)
         
         return attrs
     
     def create(self, validated_data):
         """
         Create user with encrypted password
+        
+        A parallel sign-up can take the email or username between validate()
+        and the insert; the unique indexes reject it and the caller gets the
+        same validation error as a sequential duplicate.
         """
+        try:
+            # Savepoint so the lookup below still works inside a transaction
+            with transaction.atomic():
+                return self._create_user(validated_data)
+        except IntegrityError:
+            conflicts = find_conflicts(
+                CustomUser.objects.normalize_email(validated_data.get('email')),
+                validated_data.get('username')
+            )
+            if not conflicts:
+                raise
+            raise conflict_error(conflicts)
+    
+    def _create_user(self, validated_data):
         # Remove password_confirm from validated_data
         validated_data.pop('password_confirm', None)
         
+        # Hash computed off the request thread by the register view
+        password_hash = validated_data.pop('password_hash', None)
+        if password_hash:
+            user = CustomUser(
+                username=CustomUser.normalize_username(validated_data['username']),
+                email=CustomUser.objects.normalize_email(validated_data['email']),
+                password=password_hash,
+                first_name=validated_data.get('first_name', ''),
+                last_name=validated_data.get('last_name', ''),
+                role=validated_data.get('role', 'user'),
+                phone_number=validated_data.get('phone_number', '')
+            )
+            user.save()
+            return user
+        
         # Create user
         user = CustomUser.objects.create_user(
             username=validated_data['username'],
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from judiciary_platform.caching import invalidate
+from judiciary_platform.db_router import stick_user
+
+from .authentication import invalidate_principal
+from .blacklist import bump_version, get_blacklist_filter
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_profile_cache(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Drop the cached profile response when the user row changes"""
+    if raw:
+        return
+    # update_last_login() only writes last_login, which the profile does not expose
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate('user_profile', instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_auth_principal(sender, instance, raw=False, **kwargs):
+    """Bump the principal version stamp so role/active changes apply on the next request"""
+    if raw:
+        return
+    invalidate_principal(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def sync_blacklist_filter(sender, instance, created, raw=False, **kwargs):
+    """Add the token to this process's filter and tell other processes to resync"""
+    if raw or not created:
+        return
+    get_blacklist_filter().add(instance.token.jti)
+    transaction.on_commit(bump_version)
+
+
+@receiver(post_save, sender=CustomUser)
+def pin_new_user_to_primary(sender, instance, created, raw=False, **kwargs):
+    """A new account's first requests must not miss it on a lagging replica"""
+    if raw or not created:
+        return
+    transaction.on_commit(lambda: stick_user(instance.pk))
@@ -0,0 +1,78 @@
+import tempfile
+from datetime import timedelta
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import TokenBlacklistFilter
+from .models import CustomUser
+from .serializers import find_conflicts
+
+
+class PrincipalCacheTests(TestCase):
+    """A deactivated user is rejected on the next request, whichever process deactivated them"""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username='member', email='member@example.com', password='pass-1234'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def profile_status(self):
+        return self.client.get('/api/auth/profile/').status_code
+
+    def test_deactivated_elsewhere_with_process_local_cache(self):
+        self.assertEqual(self.profile_status(), 200)
+        # update() sends no signal, like a save in another process whose
+        # version bump lands in that process's own locmem cache
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.profile_status(), 401)
+
+    def test_deactivated_with_shared_cache(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+        }):
+            self.assertEqual(self.profile_status(), 200)
+            self.user.is_active = False
+            # The version bump runs on commit
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+            self.assertEqual(self.profile_status(), 401)
+            caches['default'].clear()
+
+
+class BlacklistFilterSyncTests(TestCase):
+    """Rows committed out of id order still reach a filter that loaded a higher id"""
+
+    def blacklist(self, row_id, jti):
+        token = OutstandingToken.objects.create(
+            jti=jti, token=jti, created_at=timezone.now(), expires_at=timezone.now() + timedelta(days=1)
+        )
+        BlacklistedToken.objects.create(id=row_id, token=token)
+
+    def test_row_committed_below_last_id(self):
+        blacklist_filter = TokenBlacklistFilter(max_staleness=0)
+        self.blacklist(50, 'committed-first')
+        blacklist_filter.sync()
+        self.assertEqual(blacklist_filter.last_id, 50)
+
+        self.blacklist(40, 'committed-late')
+        blacklist_filter.sync()
+        self.assertIn('committed-late', blacklist_filter.bloom)
+        self.assertEqual((blacklist_filter.last_id, blacklist_filter.bloom.count), (50, 2))
+
+
+class EmailLookupTests(TestCase):
+    """Emails are stored lowercased and looked up exactly"""
+
+    def test_lookups_ignore_case(self):
+        user = CustomUser.objects.create_user(username='member', email=' Member@Example.COM', password='pass-1234')
+        self.assertEqual(user.email, 'member@example.com')
+        self.assertEqual(CustomUser.objects.get_by_natural_key('MEMBER@example.com '), user)
+        email = CustomUser.objects.normalize_email('MEMBER@EXAMPLE.COM')
+        self.assertEqual(find_conflicts(email, 'someone-else'), {'email'})
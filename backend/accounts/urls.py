@@ -1,5 +1,6 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
+from judiciary_platform.throttling import ClientIPThrottle
 from . import views
 
 app_name = 'accounts'
@@ -9,7 +10,7 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
     path('logout/', views.logout, name='logout'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', TokenRefreshView.as_view(throttle_classes=[ClientIPThrottle]), name='token_refresh'),
     
     # User profile endpoints
     path('profile/', views.get_user_profile, name='get_profile'),
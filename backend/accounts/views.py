@@ -1,26 +1,36 @@
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
+from asgiref.sync import sync_to_async
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.http import JsonResponse
 from .models import CustomUser
 from .serializers import UserSerializer, UserRegistrationSerializer
+from .tokens import FilteredRefreshToken
+from .hashing import HashingOverloaded, aauthenticate, ahash_password
+from judiciary_platform.async_views import async_api_view
+from judiciary_platform.caching import cache_response, conditional_get
+from judiciary_platform.throttling import AccountThrottle, ClientIPThrottle, LoginEmailThrottle, RegisterEmailThrottle
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
-def register(request):
+@throttle_classes([ClientIPThrottle, RegisterEmailThrottle])
+async def register(request):
     """
     User registration endpoint
+    
+    Async: the password hash is computed on the bounded hashing pool
+    (accounts.hashing) while the worker serves other requests.
     """
     try:
         serializer = UserRegistrationSerializer(data=request.data)
         
-        if serializer.is_valid():
+        if await sync_to_async(serializer.is_valid)():
             # Validate password
             password = serializer.validated_data['password']
             try:
@@ -32,10 +42,11 @@ def register(request):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Create user
-            user = serializer.save()
+            password_hash = await ahash_password(password)
+            user = await sync_to_async(serializer.save)(password_hash=password_hash)
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = await sync_to_async(RefreshToken.for_user)(user)
             access_token = refresh.access_token
             
             return Response({
@@ -51,7 +62,15 @@ def register(request):
                 'error': 'Registration failed',
                 'details': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
-            
+    
+    except serializers.ValidationError as e:
+        # Lost a race with a parallel sign-up for the same email/username
+        return Response({
+            'error': 'Registration failed',
+            'details': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except HashingOverloaded as e:
+        return _overloaded_response('Registration failed', e)
     except Exception as e:
         return Response({
             'error': 'Registration failed',
@@ -59,9 +78,11 @@ def register(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
-def login(request):
+@throttle_classes([ClientIPThrottle, LoginEmailThrottle])
+async def login(request):
     """
     User login endpoint
     """
@@ -74,13 +95,13 @@ def login(request):
                 'error': 'Email and password are required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Authenticate user
-        user = authenticate(request, username=email, password=password)
+        # Authenticate user (password check runs on the hashing pool)
+        user = await aauthenticate(request, email, password)
         
         if user is not None:
             if user.is_active:
                 # Generate JWT tokens
-                refresh = RefreshToken.for_user(user)
+                refresh = await sync_to_async(RefreshToken.for_user)(user)
                 access_token = refresh.access_token
                 
                 return Response({
@@ -99,7 +120,9 @@ def login(request):
             return Response({
                 'error': 'Invalid email or password'
             }, status=status.HTTP_401_UNAUTHORIZED)
-            
+    
+    except HashingOverloaded as e:
+        return _overloaded_response('Login failed', e)
     except Exception as e:
         return Response({
             'error': 'Login failed',
@@ -107,8 +130,18 @@ def login(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _overloaded_response(error, exc):
+    response = Response({
+        'error': error,
+        'message': str(exc)
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = '1'
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AccountThrottle])
 def logout(request):
     """
     User logout endpoint (blacklist refresh token)
@@ -117,7 +150,7 @@ def logout(request):
         refresh_token = request.data.get('refresh_token')
         
         if refresh_token:
-            token = RefreshToken(refresh_token)
+            token = FilteredRefreshToken(refresh_token)
             token.blacklist()
         
         return Response({
@@ -131,14 +164,23 @@ def logout(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
+def user_profile_modified(request):
+    """Last-Modified source for get_user_profile (the cached principal has no updated_at)"""
+    return CustomUser.objects.filter(pk=request.user.pk).values_list('updated_at', flat=True).first()
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AccountThrottle])
+@conditional_get('user_profile', user_profile_modified)
+@cache_response('user_profile')
 def get_user_profile(request):
     """
     Get current user profile
     """
     try:
-        serializer = UserSerializer(request.user)
+        # ?fields= / ?exclude= select the rendered fields
+        serializer = UserSerializer(request.user, context={'request': request})
         return Response({
             'user': serializer.data
         }, status=status.HTTP_200_OK)
@@ -152,6 +194,7 @@ def get_user_profile(request):
 
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AccountThrottle])
 def update_user_profile(request):
     """
     Update current user profile
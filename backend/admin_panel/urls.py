@@ -1,5 +1,11 @@
 from django.urls import path
+from . import views
+
+app_name = 'admin_panel'
 
 urlpatterns = [
     # Admin panel endpoints will be implemented in Task 11
+    
+    # Monitoring
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from accounts.hashing import get_hashing_pool
+from accounts.blacklist import shared_stats
+from judiciary_platform.logging_pipeline import pipeline_stats
+from judiciary_platform.metrics import PrometheusWriter, render_request_metrics
+
+
+def _metrics_token_valid(request) -> bool:
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    supplied = request.headers.get('X-Metrics-Token', '')
+    return bool(token) and hmac.compare_digest(token, supplied)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def metrics(request):
+    """
+    Request metrics in the Prometheus text format
+    
+    For admins, or for scrapers sending the METRICS_TOKEN setting in an
+    X-Metrics-Token header.
+    """
+    user = request.user
+    is_admin = user.is_authenticated and (user.is_staff or user.role == 'admin')
+    if not is_admin and not _metrics_token_valid(request):
+        return Response({
+            'error': 'Admin access required'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    writer = PrometheusWriter()
+    render_request_metrics(writer)
+    writer.gauges('password_hashing', get_hashing_pool().snapshot(), 'Password hashing pool')
+    writer.gauges('token_blacklist_filter', shared_stats(), 'Token blacklist filter checks (all processes)')
+    writer.gauges('log_queue', pipeline_stats(), 'Logging pipeline queue')
+    return HttpResponse(writer.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,81 @@
+"""
+Async function views for Django REST framework (which only ships sync ones).
+
+    @async_api_view(['POST'])
+    @permission_classes([AllowAny])
+    async def login(request):
+        ...
+
+Authentication, permission and throttle checks run through sync_to_async
+before the handler, so the view body only has to wrap its own ORM calls.
+Under ASGI the event loop keeps serving other requests while the handler
+awaits; under WSGI Django runs the coroutine to completion per request.
+"""
+import asyncio
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from rest_framework.decorators import api_view
+
+
+class AsyncAPIViewMixin:
+    """APIView.dispatch as a coroutine"""
+
+    view_is_async = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # APIView wraps the view in csrf_exempt, which drops Django's
+        # coroutine marker on 4.2
+        markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication may query the database
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def async_api_view(http_method_names=None):
+    """Like rest_framework.decorators.api_view, for `async def` views"""
+    http_method_names = ['GET'] if (http_method_names is None) else http_method_names
+
+    def decorator(func):
+        # Let api_view collect the policy attributes (permission_classes etc.)
+        wrapped_class = api_view(http_method_names)(func).cls
+        AsyncWrappedAPIView = type(
+            wrapped_class.__name__,
+            (AsyncAPIViewMixin, wrapped_class),
+            {'__doc__': func.__doc__, '__module__': func.__module__}
+        )
+
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        for method in http_method_names:
+            setattr(AsyncWrappedAPIView, method.lower(), handler)
+
+        return AsyncWrappedAPIView.as_view()
+
+    return decorator
@@ -0,0 +1,243 @@
+"""
+Response caching for hot read endpoints.
+
+Keys are versioned twice: by a namespace generation (bumped to drop every
+entry of an endpoint, e.g. all search pages) and by a scope generation
+(bumped to drop one user's / object's entries). Bumping a generation makes
+old keys unreachable; they then age out through their TTL, so invalidation
+never has to enumerate keys and works the same on every cache backend.
+"""
+import hashlib
+import time
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+# Bump when the shape of cached payloads changes (e.g. serializer fields)
+SCHEMA_VERSION = 1
+
+DEFAULT_TTL = 300
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def is_shared_cache(cache=None) -> bool:
+    """Whether other processes see what this one stores (file, Redis, memcached...)"""
+    return not isinstance(cache or get_cache(), (LocMemCache, DummyCache))
+
+
+def get_ttl(namespace: str) -> int:
+    return getattr(settings, 'CACHE_TTLS', {}).get(namespace, DEFAULT_TTL)
+
+
+def _generation_key(namespace: str, scope=None) -> str:
+    if scope is None:
+        return f'gen:{namespace}'
+    return f'gen:{namespace}:{scope}'
+
+
+def _bumped_at_key(generation_key: str) -> str:
+    return f'{generation_key}:at'
+
+
+def _generations(namespace: str, scope=None):
+    keys = [_generation_key(namespace)]
+    if scope is not None:
+        keys.append(_generation_key(namespace, scope))
+    found = get_cache().get_many(keys)
+    return [found.get(key, 0) for key in keys]
+
+
+def generation_state(namespace: str, scope=None):
+    """(generations, time of the latest bump or None) in one cache read"""
+    keys = [_generation_key(namespace)]
+    if scope is not None:
+        keys.append(_generation_key(namespace, scope))
+    found = get_cache().get_many(keys + [_bumped_at_key(key) for key in keys])
+    bumps = [found[_bumped_at_key(key)] for key in keys if _bumped_at_key(key) in found]
+    return [found.get(key, 0) for key in keys], max(bumps, default=None)
+
+
+def make_key(namespace: str, scope=None, variant: str = '', generations=None) -> str:
+    """Versioned cache key for one entry of `namespace` (pass `generations` already read)"""
+    if generations is None:
+        generations = _generations(namespace, scope)
+    versions = '.'.join(str(generation) for generation in generations)
+    digest = hashlib.md5(variant.encode()).hexdigest()[:16] if variant else '-'
+    return f'resp:{namespace}:s{SCHEMA_VERSION}:{scope}:g{versions}:{digest}'
+
+
+def bump_counter(key: str, delta: int = 1):
+    """Increment a non-expiring counter in the cache, creating it if missing"""
+    cache = get_cache()
+    # Counters never expire: losing a generation would resurrect stale entries
+    if cache.add(key, delta, timeout=None):
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, delta, timeout=None)
+
+
+def within_replica_lag(bumped_at) -> bool:
+    """
+    Whether the latest bump (see generation_state) is younger than
+    REPLICA_STICKY_SECONDS while read replicas are configured. Rows read then
+    may come from a replica that has not caught up with the change, so they
+    must not be cached under the new generation.
+    """
+    if bumped_at is None or not getattr(settings, 'DATABASE_REPLICAS', []):
+        return False
+    return time.time() - bumped_at < getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def invalidate(namespace: str, scope=None):
+    """
+    Drop cached entries of a namespace (scope=None) or of one scope in it.
+
+    Runs after the surrounding transaction commits so a concurrent request
+    cannot re-cache the old rows under the new generation. The bump time is
+    recorded next to the generation; with read replicas, readers do not
+    store entries until the replicas have caught up (within_replica_lag).
+    """
+    key = _generation_key(namespace, scope)
+
+    def bump_generation():
+        bump_counter(key)
+        # Last-Modified of conditional_get() responses, replica lag window
+        get_cache().set(_bumped_at_key(key), time.time(), timeout=None)
+
+    transaction.on_commit(bump_generation)
+
+
+def cache_response(namespace: str, per_user: bool = True, vary_on_query: bool = True):
+    """
+    Cache successful GET responses of a DRF function view.
+
+    Apply below @api_view/@permission_classes so authentication and
+    permission checks still run on every request. With `per_user` the entry
+    is scoped to request.user.pk and invalidate(namespace, user_id) drops it;
+    otherwise it is shared and only namespace invalidation applies. Cached
+    data is re-rendered per request, so content negotiation keeps working.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            scope = None
+            if per_user:
+                if not request.user.is_authenticated:
+                    return view(request, *args, **kwargs)
+                scope = request.user.pk
+
+            variant = request.get_full_path() if vary_on_query else request.path
+            generations, bumped_at = generation_state(namespace, scope)
+            # Payloads may embed absolute URLs (pagination links)
+            key = make_key(namespace, scope, f'{request.get_host()}{variant}', generations)
+
+            cache = get_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                response = Response(cached)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not within_replica_lag(bumped_at):
+                cache.set(key, response.data, get_ttl(namespace))
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def _weak(etag: str) -> str:
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _not_modified(request, etag: str, last_modified: int) -> bool:
+    """RFC 7232: If-None-Match (weak comparison) wins over If-Modified-Since"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        return '*' in tags or _weak(etag) in {_weak(tag) for tag in tags}
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+    return since is not None and last_modified <= since
+
+
+def conditional_get(namespace: str, last_modified):
+    """
+    Weak ETag / Last-Modified validators and 304 responses for a per-user
+    DRF function view whose data is invalidated under `namespace`.
+
+    `last_modified(request)` returns the newest updated_at behind the
+    response (one indexed lookup), or None when there is nothing to
+    validate. The ETag also covers the namespace/user generations, so
+    changes that leave updated_at alone (counters, related rows) still
+    change it, and Last-Modified is never older than the latest
+    invalidation. The lookup result is cached under the current
+    generations: an unchanged resource is answered from the cache alone,
+    before the view runs any query or serializer. Apply above cache_response.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            scope = request.user.pk
+            generations, bumped_at = generation_state(namespace, scope)
+            versions = '.'.join(str(generation) for generation in generations)
+            key = f'cond:{namespace}:s{SCHEMA_VERSION}:{scope}:g{versions}'
+
+            cache = get_cache()
+            updated_at = cache.get(key)
+            if updated_at is None:
+                modified = last_modified(request)
+                if modified is None:
+                    return view(request, *args, **kwargs)
+                updated_at = modified.timestamp()
+                if not within_replica_lag(bumped_at):
+                    cache.set(key, updated_at, get_ttl(namespace))
+
+            modified_at = int(max(updated_at, bumped_at or 0))
+            # Representations differ by query string (?fields=)
+            digest = hashlib.md5(f'{key}:{modified_at}:{request.get_full_path()}'.encode()).hexdigest()[:20]
+            etag = f'W/"{digest}"'
+
+            if _not_modified(request, etag, modified_at):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(modified_at)
+            # Per-user data: browsers may keep it but must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate_lawyer(user_id: Optional[int] = None):
+    """A lawyer profile changed: drop its cached profile/status and all search pages"""
+    if user_id is not None:
+        invalidate('lawyer_profile', user_id)
+        invalidate('verification_status', user_id)
+    invalidate('lawyer_search')
@@ -0,0 +1,40 @@
+"""
+SQLite backend tuned for a concurrently used local database.
+
+Same as django.db.backends.sqlite3 plus two extra OPTIONS, which are
+consumed here instead of being passed to sqlite3.connect():
+
+- 'pragmas': PRAGMA name -> value, applied to every new connection, e.g.
+  journal_mode=WAL so readers never wait for a writer, synchronous=NORMAL
+  (safe with WAL, fsync on checkpoint only), busy_timeout and cache_size.
+- 'transaction_mode': DEFERRED (SQLite's default), IMMEDIATE or EXCLUSIVE
+  for atomic() blocks. IMMEDIATE takes the write lock on BEGIN, so two
+  writers queue on busy_timeout instead of one failing with "database is
+  locked" when its read lock cannot be upgraded.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop('pragmas', {})
+        self.transaction_mode = (kwargs.pop('transaction_mode', None) or 'DEFERRED').upper()
+        if self.transaction_mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"DATABASES transaction_mode must be one of {', '.join(TRANSACTION_MODES)}"
+            )
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
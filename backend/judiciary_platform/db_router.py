@@ -0,0 +1,140 @@
+"""
+Read replica routing.
+
+Reads of the models in REPLICA_READ_MODELS go to a randomly chosen alias of
+DATABASE_REPLICAS; everything else, all writes and anything inside an
+atomic() block stay on 'default'. With no replicas configured the router
+always answers None and Django uses 'default' as before.
+
+Read-your-writes: once a request writes, the rest of it reads from the
+primary, and the acting user (or a newly created user) stays pinned to the
+primary for REPLICA_STICKY_SECONDS, longer than the replicas' lag. Pins are
+kept in the response cache, so they are shared between processes only
+with a shared cache backend.
+"""
+import random
+from contextvars import ContextVar
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from judiciary_platform.caching import get_cache
+
+PIN_KEY_PREFIX = 'replica_pin:user:'
+
+
+class RequestState:
+    """Routing state of the current request"""
+
+    def __init__(self):
+        self.user_id = None
+        self.pinned = False
+        self.wrote = False
+
+
+_state: ContextVar[Optional[RequestState]] = ContextVar('replica_request_state', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def _pin_key(user_id) -> str:
+    return f'{PIN_KEY_PREFIX}{user_id}'
+
+
+def stick_user(user_id):
+    """Read this user's data from the primary until the replicas have caught up"""
+    if replicas() and user_id is not None:
+        get_cache().set(_pin_key(user_id), 1, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+
+
+def set_request_user(user_id):
+    """Called once the request's user is known (accounts.authentication)"""
+    state = _state.get()
+    if state is None or not replicas():
+        return
+    state.user_id = user_id
+    if not state.pinned and get_cache().get(_pin_key(user_id)):
+        state.pinned = True
+
+
+class ReplicaRouter:
+
+    def _routed(self, model) -> bool:
+        return model._meta.label_lower in getattr(settings, 'REPLICA_READ_MODELS', [])
+
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases or not self._routed(model):
+            return None
+        state = _state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its own uncommitted rows
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        if db in replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Gives each request its own routing state and, after a request that
+    wrote, pins its user to the primary (see the module docstring)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RequestState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        self._finish(state)
+        return response
+
+    async def __acall__(self, request):
+        state = RequestState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            await sync_to_async(self._finish)(state)
+        return response
+
+    def _finish(self, state: RequestState):
+        if state.wrote:
+            stick_user(state.user_id)
@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets for read endpoints.
+
+`?fields=id,full_name` renders only the listed fields and
+`?exclude=bio,office_address` drops fields. Serializers with
+SparseFieldsetMixin read both from the request in their context (GET
+only, so writes always see every field) or from `fields=`/`exclude=`
+keyword arguments. columns() and project() push the same selection down
+into the SQL column list, so unrendered columns are not loaded either.
+"""
+from typing import List, Optional
+
+from django.db.models import QuerySet
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def parse_field_list(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin selecting the rendered fields; unknown names are ignored,
+    and a selection that leaves no field falls back to all of them.
+
+    FIELD_COLUMNS maps fields that are not backed by a column of their own
+    (properties, *_display, related names) to the columns they read.
+    Other fields read the column named by their source.
+    """
+
+    FIELD_COLUMNS = {}
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+        if request is not None and request.method == 'GET':
+            if fields is None:
+                fields = parse_field_list(request.query_params.get(FIELDS_PARAM))
+            if exclude is None:
+                exclude = parse_field_list(request.query_params.get(EXCLUDE_PARAM))
+
+        selected = [
+            name for name in self.fields
+            if (not fields or name in fields) and name not in (exclude or ())
+        ]
+        # A selection matching no field (typos, wrong case, everything
+        # excluded) renders every field rather than empty objects
+        if selected:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+    def columns(self) -> List[str]:
+        """Model columns (lookup paths) the selected fields read, in field order"""
+        columns = []
+        for name, field in self.fields.items():
+            for column in self.FIELD_COLUMNS.get(name, (field.source.replace('.', '__'),)):
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    def project(self, queryset: QuerySet) -> QuerySet:
+        """only() the selected columns, joining the relations they go through"""
+        columns = self.columns()
+        relations = set()
+        for column in columns:
+            parts = column.split('__')[:-1]
+            relations.update('__'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*relations, *columns)
@@ -0,0 +1,305 @@
+"""
+Non-blocking logging: request threads only put records on a bounded queue;
+one background listener per process formats them, writes them in batches
+(one flush per batch instead of per record) and rotates the log file.
+
+Wired up in settings.LOGGING: the 'queue' handler (queue_handler()) is the
+only handler loggers use. It forwards to the handlers of its `sink` logger,
+which nothing logs to directly. configure_logging() (settings.LOGGING_CONFIG)
+runs dictConfig and then starts each listener on its sink's handlers. When
+the queue is full records are dropped and counted instead of blocking the
+request (see pipeline_stats()).
+"""
+import atexit
+import gzip
+import json
+import logging
+import logging.config
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process writes a file of its own
+    fcntl = None
+
+# LogRecord attributes that are not `extra=` fields
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields are included as keys"""
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc_info'] = record.exc_text
+        if record.stack_info:
+            payload['stack_info'] = record.stack_info
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotates at maxBytes or every `interval` seconds, whichever comes first,
+    and gzips rotated files (django.log.1.gz, ...).
+
+    Each file has a single writer, so sizes and rotations never race between
+    processes (gunicorn workers, forked children). The first process to
+    write takes an exclusive lock on `<filename>.lock` and writes the
+    configured file; every other process writes `<name>.<pid><ext>`
+    (django.1234.log) and rotates that one. The file is opened on first
+    write, in the process that writes it.
+
+    Under the pipeline listener (`batched`) records are written without a
+    flush; the listener calls flush() once per batch.
+    """
+
+    def __init__(self, filename, interval: int = 0, **kwargs):
+        self.interval = interval
+        self.batched = False
+        self._size = 0
+        self._pid = None
+        self._owner_lock = None
+        kwargs['delay'] = True
+        super().__init__(filename, **kwargs)
+        self.shared_filename = self.baseFilename
+        self.rollover_at = time.time() + interval if interval else None
+
+    def _claim_file(self):
+        """Pick the file this process writes, see the class docstring"""
+        # Stream and lock inherited across a fork belong to the parent
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self._owner_lock is not None:
+            self._owner_lock.close()
+            self._owner_lock = None
+        self._pid = os.getpid()
+        self.baseFilename = self.shared_filename
+        if fcntl is not None:
+            lock = open(self.shared_filename + '.lock', 'a')
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock.close()
+            else:
+                self._owner_lock = lock
+                return
+        root, ext = os.path.splitext(self.shared_filename)
+        self.baseFilename = f'{root}.{self._pid}{ext}'
+
+    def namer(self, name):
+        return name + '.gz'
+
+    def rotator(self, source, dest):
+        with open(source, 'rb') as plain, gzip.open(dest, 'wb') as compressed:
+            shutil.copyfileobj(plain, compressed)
+        os.remove(source)
+
+    def _open(self):
+        stream = super()._open()
+        self._size = os.path.getsize(self.baseFilename)
+        return stream
+
+    def _encoded_size(self, message: str) -> int:
+        return len(message.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+
+    def _rollover_due(self, pending: int) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        # Own byte count: stream.tell() would flush the buffered batch
+        return self.maxBytes > 0 and self._size > 0 and self._size + pending > self.maxBytes
+
+    def doRollover(self):
+        super().doRollover()
+        if self.stream is None:
+            self._size = 0
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+    def emit(self, record):
+        try:
+            if self._pid != os.getpid():
+                self._claim_file()
+            message = self.format(record) + self.terminator
+            size = self._encoded_size(message)
+            if self._rollover_due(size):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(message)
+            self._size += size
+            if not self.batched:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        super().close()
+        if self._owner_lock is not None and self._pid == os.getpid():
+            self._owner_lock.close()
+            self._owner_lock = None
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that drains up to `batch_size` records, then flushes once"""
+
+    def __init__(self, log_queue, *handlers, batch_size: int = 500):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        for handler in handlers:
+            if hasattr(handler, 'batched'):
+                handler.batched = True
+
+    def _monitor(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = False
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if stopping:
+                return
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueues without ever waiting; a full queue drops the record"""
+
+    def __init__(self, pipeline: 'LogPipeline'):
+        super().__init__(pipeline.queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        # Render the message and traceback here (arguments may change after
+        # the call returns) but keep them apart for the JSON formatter
+        record = logging.makeLogRecord(vars(record))
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self.pipeline.ensure_running()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class LogPipeline:
+    """The queue and listener of one process (restarted after a fork)"""
+
+    def __init__(self, sink: str, maxsize: int, batch_size: int):
+        self.sink = sink
+        self.handlers = None
+        self.queue = queue.Queue(maxsize)
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.listener = None
+        self.pid = None
+        self._lock = threading.Lock()
+
+    def attach(self, handlers: List[logging.Handler]):
+        """Set the target handlers and start the listener (see configure_logging())"""
+        self.handlers = list(handlers)
+        self.ensure_running()
+
+    def ensure_running(self):
+        # Records queued before attach() wait for the listener
+        if self.pid == os.getpid() or self.handlers is None:
+            return
+        with self._lock:
+            if self.pid == os.getpid():
+                return
+            # A forked child inherits the queue but not the listener thread
+            self.listener = BatchingQueueListener(self.queue, *self.handlers, batch_size=self.batch_size)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def stop(self):
+        if self.pid == os.getpid() and self.listener is not None:
+            try:
+                self.listener.stop()
+            except queue.Full:
+                # No room for the stop sentinel; the daemon thread dies with the process
+                pass
+            self.pid = None
+
+    def stats(self) -> Dict[str, int]:
+        return {'queued': self.queue.qsize(), 'capacity': self.queue.maxsize, 'dropped': self.dropped}
+
+
+_pipelines: List[LogPipeline] = []
+
+
+def queue_handler(sink: str, maxsize: int = 10000, batch_size: int = 500):
+    """dictConfig factory for the 'queue' handler, writing to the handlers of logger `sink`"""
+    pipeline = LogPipeline(sink, maxsize, batch_size)
+    _pipelines.append(pipeline)
+    return NonBlockingQueueHandler(pipeline)
+
+
+def configure_logging(logging_settings):
+    """
+    settings.LOGGING_CONFIG: dictConfig, then start the queue listeners.
+
+    The listeners are built only once dictConfig has created every handler,
+    and find their targets through the public logger API.
+    """
+    logging.config.dictConfig(logging_settings)
+    for pipeline in _pipelines:
+        if pipeline.handlers is None:
+            sink = logging.getLogger(pipeline.sink)
+            if not sink.handlers:
+                raise ValueError(f"Log pipeline sink '{pipeline.sink}' has no handlers")
+            pipeline.attach(sink.handlers)
+
+
+def pipeline_stats() -> Dict[str, int]:
+    """Queue depth and dropped records, summed over this process's pipelines"""
+    totals = {'queued': 0, 'capacity': 0, 'dropped': 0}
+    for pipeline in _pipelines:
+        for key, value in pipeline.stats().items():
+            totals[key] += value
+    return totals
+
+
+@atexit.register
+def _drain():
+    # Write whatever is still queued before the process exits
+    for pipeline in _pipelines:
+        pipeline.stop()
@@ -0,0 +1,319 @@
+"""
+Per-endpoint request metrics, exported at /api/admin/metrics/ in the
+Prometheus text format.
+
+RequestMetricsMiddleware times each request and attributes its database
+queries (count and time, through a connection execute wrapper), serializer
+time and response size to the URL name. Queries run while a serializer is
+rendering are also counted separately, so N+1 patterns in serializers show
+up as a high serializer_queries per request.
+
+Recording never takes a lock: totals are kept per thread and summed when
+scraped, and rolling percentiles come from fixed-size ring buffers whose
+slots are claimed with itertools.count (atomic under the GIL).
+"""
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Prometheus histogram buckets for request latency, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+UNMATCHED = '<unmatched>'
+
+
+class RingBuffer:
+    """The last `size` samples; writers never block each other"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._slots: List[Optional[float]] = [None] * size
+        self._sequence = itertools.count()
+
+    def add(self, value: float):
+        self._slots[next(self._sequence) % self.size] = value
+
+    def quantiles(self, quantiles=QUANTILES) -> Dict[float, float]:
+        samples = sorted(value for value in list(self._slots) if value is not None)
+        if not samples:
+            return {}
+        last = len(samples) - 1
+        return {quantile: samples[min(last, round(quantile * last))] for quantile in quantiles}
+
+
+class RequestMetrics:
+    """Measurements of the request in progress"""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_queries = 0
+        self.serializer_depth = 0
+
+
+class EndpointTotals:
+    """Counters for one endpoint in one thread"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_queries = 0
+        self.response_bytes = 0
+
+    def merge(self, other: 'EndpointTotals'):
+        for name, value in vars(other).items():
+            if name == 'latency_buckets':
+                self.latency_buckets = [a + b for a, b in zip(self.latency_buckets, value)]
+            else:
+                setattr(self, name, getattr(self, name) + value)
+
+
+class MetricsRegistry:
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._local = threading.local()
+        self._thread_totals: List[Dict[str, EndpointTotals]] = []
+        self._register_lock = threading.Lock()
+        self.latency = {}
+        self.queries = {}
+
+    def _totals(self) -> Dict[str, EndpointTotals]:
+        totals = getattr(self._local, 'totals', None)
+        if totals is None:
+            totals = self._local.totals = {}
+            # Once per thread
+            with self._register_lock:
+                self._thread_totals.append(totals)
+        return totals
+
+    def buffer(self, buffers: Dict[str, RingBuffer], endpoint: str) -> RingBuffer:
+        buffer = buffers.get(endpoint)
+        if buffer is None:
+            buffer = buffers.setdefault(endpoint, RingBuffer(self.window))
+        return buffer
+
+    def record(self, endpoint: str, duration: float, status_code: int, size: int, request: RequestMetrics):
+        totals = self._totals()
+        endpoint_totals = totals.get(endpoint)
+        if endpoint_totals is None:
+            endpoint_totals = totals[endpoint] = EndpointTotals()
+        endpoint_totals.requests += 1
+        endpoint_totals.errors += status_code >= 500
+        endpoint_totals.latency_sum += duration
+        endpoint_totals.latency_buckets[next(
+            (index for index, bound in enumerate(LATENCY_BUCKETS) if duration <= bound), len(LATENCY_BUCKETS)
+        )] += 1
+        endpoint_totals.db_queries += request.db_queries
+        endpoint_totals.db_time += request.db_time
+        endpoint_totals.serializer_time += request.serializer_time
+        endpoint_totals.serializer_queries += request.serializer_queries
+        endpoint_totals.response_bytes += size
+        self.buffer(self.latency, endpoint).add(duration)
+        self.buffer(self.queries, endpoint).add(request.db_queries)
+
+    def totals(self) -> Dict[str, EndpointTotals]:
+        merged = {}
+        for thread_totals in list(self._thread_totals):
+            for endpoint, endpoint_totals in list(thread_totals.items()):
+                merged.setdefault(endpoint, EndpointTotals()).merge(endpoint_totals)
+        return merged
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar('request_metrics', default=None)
+
+_registry = None
+
+
+def get_registry() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry(getattr(settings, 'METRICS_WINDOW', 1024))
+    return _registry
+
+
+def query_timer(execute, sql, params, many, context):
+    """Execute wrapper attributing query count and time to the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.db_queries += 1
+        if metrics.serializer_depth:
+            metrics.serializer_queries += 1
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    # Installed per connection rather than per request: under ASGI the
+    # queries of one request run on other threads' connections
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+class TimedSerializerMixin:
+    """Adds a serializer's rendering time (outermost call only) to the request metrics"""
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None:
+            return super().to_representation(instance)
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serializer_time += time.perf_counter() - started
+
+
+def endpoint_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None and match.view_name else UNMATCHED
+
+
+def response_size(response) -> int:
+    if getattr(response, 'streaming', False):
+        return int(response.get('Content-Length') or 0)
+    return len(response.content)
+
+
+class RequestMetricsMiddleware:
+    """Records latency, queries, serializer time and size per URL name"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # Connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(None, connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, time.perf_counter() - started, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, time.perf_counter() - started, metrics)
+        return response
+
+    def _record(self, request, response, duration, metrics):
+        get_registry().record(endpoint_name(request), duration, response.status_code, response_size(response), metrics)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+class PrometheusWriter:
+    """Minimal text exposition format (version 0.0.4) writer"""
+
+    def __init__(self, prefix: str = 'judiciary_'):
+        self.prefix = prefix
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f'# HELP {self.prefix}{name} {help_text}')
+        self.lines.append(f'# TYPE {self.prefix}{name} {kind}')
+
+    def sample(self, name: str, value, **labels):
+        label_text = ','.join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+        self.lines.append(f'{self.prefix}{name}{{{label_text}}} {_format_value(value)}' if labels
+                          else f'{self.prefix}{name} {_format_value(value)}')
+
+    def gauges(self, group: str, values: Dict, help_text: str):
+        """One gauge per numeric entry of a stats dict, e.g. a pool snapshot"""
+        for key, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.family(f'{group}_{key}', 'gauge', f'{help_text}: {key}')
+                self.sample(f'{group}_{key}', value)
+
+    def render(self) -> str:
+        return '\n'.join(self.lines) + '\n'
+
+
+def render_request_metrics(writer: PrometheusWriter, registry: MetricsRegistry = None):
+    registry = registry or get_registry()
+    totals = registry.totals()
+    endpoints = sorted(totals)
+
+    writer.family('http_request_duration_seconds', 'histogram', 'Request latency per URL name')
+    for endpoint in endpoints:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), totals[endpoint].latency_buckets):
+            cumulative += count
+            writer.sample('http_request_duration_seconds_bucket', cumulative, endpoint=endpoint, le=bound)
+        writer.sample('http_request_duration_seconds_sum', totals[endpoint].latency_sum, endpoint=endpoint)
+        writer.sample('http_request_duration_seconds_count', totals[endpoint].requests, endpoint=endpoint)
+
+    writer.family('http_request_recent_duration_seconds', 'summary',
+                  f'Rolling latency quantiles over the last {registry.window} requests per URL name')
+    for endpoint in endpoints:
+        for quantile, value in registry.buffer(registry.latency, endpoint).quantiles().items():
+            writer.sample('http_request_recent_duration_seconds', value, endpoint=endpoint, quantile=quantile)
+
+    writer.family('db_queries_per_request', 'summary',
+                  f'Rolling quantiles of queries per request over the last {registry.window} requests')
+    for endpoint in endpoints:
+        for quantile, value in registry.buffer(registry.queries, endpoint).quantiles().items():
+            writer.sample('db_queries_per_request', value, endpoint=endpoint, quantile=quantile)
+
+    counters = (
+        ('http_requests_total', 'requests', 'Requests per URL name'),
+        ('http_server_errors_total', 'errors', 'Responses with a 5xx status'),
+        ('db_queries_total', 'db_queries', 'Database queries'),
+        ('db_query_seconds_total', 'db_time', 'Time spent in database queries'),
+        ('serializer_seconds_total', 'serializer_time', 'Time spent rendering serializers'),
+        ('serializer_queries_total', 'serializer_queries', 'Database queries issued while rendering serializers'),
+        ('http_response_bytes_total', 'response_bytes', 'Response body bytes'),
+    )
+    for name, attribute, help_text in counters:
+        writer.family(name, 'counter', help_text)
+        for endpoint in endpoints:
+            writer.sample(name, getattr(totals[endpoint], attribute), endpoint=endpoint)
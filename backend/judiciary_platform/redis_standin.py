@@ -0,0 +1,308 @@
+"""
+In-memory Redis stand-in speaking RESP2, for trying CACHE_BACKEND=redis
+without a Redis server:
+
+    python -m judiciary_platform.redis_standin --port 6379
+
+Implements the commands Django's RedisCache issues (strings, expiry,
+counters, MULTI/EXEC pipelines, FLUSHDB) and nothing more. Not for
+production: single process, no persistence.
+"""
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class ResponseError(Exception):
+    pass
+
+
+class Store:
+    """Keyspace per database index: key -> (value, expires_at or None)"""
+
+    def __init__(self):
+        self.databases: Dict[int, Dict[bytes, Tuple[bytes, Optional[float]]]] = {}
+
+    def db(self, index: int):
+        return self.databases.setdefault(index, {})
+
+    def get(self, db, key: bytes) -> Optional[bytes]:
+        entry = db.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del db[key]
+            return None
+        return value
+
+    def expires_at(self, db, key: bytes) -> Optional[float]:
+        return db[key][1] if self.get(db, key) is not None else None
+
+
+class Session:
+    """One client connection: selected database and pending MULTI queue"""
+
+    def __init__(self, server: 'RedisStandIn'):
+        self.server = server
+        self.db_index = 0
+        self.queued: Optional[List[List[bytes]]] = None
+
+    @property
+    def db(self):
+        return self.server.store.db(self.db_index)
+
+    def execute(self, args: List[bytes]):
+        command = args[0].upper().decode()
+        if self.queued is not None and command not in ('EXEC', 'DISCARD', 'MULTI'):
+            self.queued.append(args)
+            return 'QUEUED'
+        handler = getattr(self, f'cmd_{command.lower()}', None)
+        if handler is None:
+            raise ResponseError(f"ERR unknown command '{command}'")
+        return handler(*args[1:])
+
+    # Connection
+
+    def cmd_ping(self, message=None):
+        return message if message is not None else 'PONG'
+
+    def cmd_echo(self, message):
+        return message
+
+    def cmd_select(self, index):
+        self.db_index = int(index)
+        return 'OK'
+
+    def cmd_client(self, *args):
+        return 'OK'
+
+    def cmd_info(self, *args):
+        return b'# Server\r\nredis_version:7.0.0-standin\r\n'
+
+    # Transactions
+
+    def cmd_multi(self):
+        if self.queued is not None:
+            raise ResponseError('ERR MULTI calls can not be nested')
+        self.queued = []
+        return 'OK'
+
+    def cmd_discard(self):
+        self.queued = None
+        return 'OK'
+
+    def cmd_exec(self):
+        if self.queued is None:
+            raise ResponseError('ERR EXEC without MULTI')
+        queued, self.queued = self.queued, None
+        results = []
+        for args in queued:
+            try:
+                results.append(self.execute(args))
+            except ResponseError as e:
+                results.append(e)
+        return results
+
+    # Strings
+
+    def cmd_get(self, key):
+        return self.server.store.get(self.db, key)
+
+    def cmd_mget(self, *keys):
+        return [self.server.store.get(self.db, key) for key in keys]
+
+    def cmd_set(self, key, value, *options):
+        options = [option.upper() for option in options]
+        expires_at = None
+        keep_ttl = False
+        index = 0
+        while index < len(options):
+            option = options[index]
+            if option in (b'EX', b'PX'):
+                amount = int(options[index + 1])
+                expires_at = time.monotonic() + (amount if option == b'EX' else amount / 1000)
+                index += 1
+            elif option == b'KEEPTTL':
+                keep_ttl = True
+            elif option not in (b'NX', b'XX'):
+                raise ResponseError('ERR syntax error')
+            index += 1
+
+        exists = self.server.store.get(self.db, key) is not None
+        if (b'NX' in options and exists) or (b'XX' in options and not exists):
+            return None
+        if keep_ttl and exists:
+            expires_at = self.db[key][1]
+        self.db[key] = (value, expires_at)
+        return 'OK'
+
+    def cmd_mset(self, *pairs):
+        if not pairs or len(pairs) % 2:
+            raise ResponseError("ERR wrong number of arguments for 'mset' command")
+        for index in range(0, len(pairs), 2):
+            self.db[pairs[index]] = (pairs[index + 1], None)
+        return 'OK'
+
+    def cmd_setex(self, key, seconds, value):
+        return self.cmd_set(key, value, b'EX', seconds)
+
+    def cmd_incrby(self, key, amount):
+        current = self.server.store.get(self.db, key)
+        try:
+            value = int(current or 0) + int(amount)
+        except ValueError:
+            raise ResponseError('ERR value is not an integer or out of range')
+        expires_at = self.db[key][1] if current is not None else None
+        self.db[key] = (str(value).encode(), expires_at)
+        return value
+
+    def cmd_incr(self, key):
+        return self.cmd_incrby(key, b'1')
+
+    def cmd_decrby(self, key, amount):
+        return self.cmd_incrby(key, str(-int(amount)).encode())
+
+    def cmd_decr(self, key):
+        return self.cmd_incrby(key, b'-1')
+
+    # Keys
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self.server.store.get(self.db, key) is not None:
+                del self.db[key]
+                removed += 1
+        return removed
+
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self.server.store.get(self.db, key) is not None)
+
+    def cmd_expire(self, key, seconds):
+        return self.cmd_pexpire(key, str(int(seconds) * 1000).encode())
+
+    def cmd_pexpire(self, key, milliseconds):
+        value = self.server.store.get(self.db, key)
+        if value is None:
+            return 0
+        self.db[key] = (value, time.monotonic() + int(milliseconds) / 1000)
+        return 1
+
+    def cmd_persist(self, key):
+        value = self.server.store.get(self.db, key)
+        if value is None or self.db[key][1] is None:
+            return 0
+        self.db[key] = (value, None)
+        return 1
+
+    def cmd_ttl(self, key):
+        if self.server.store.get(self.db, key) is None:
+            return -2
+        expires_at = self.db[key][1]
+        return -1 if expires_at is None else max(0, round(expires_at - time.monotonic()))
+
+    def cmd_keys(self, pattern):
+        pattern = pattern.decode()
+        return [
+            key for key in list(self.db)
+            if self.server.store.get(self.db, key) is not None and fnmatch.fnmatchcase(key.decode(), pattern)
+        ]
+
+    def cmd_dbsize(self):
+        return len(self.db)
+
+    def cmd_flushdb(self, *args):
+        self.db.clear()
+        return 'OK'
+
+    def cmd_flushall(self, *args):
+        self.server.store.databases.clear()
+        return 'OK'
+
+
+def encode(value) -> bytes:
+    """Serialize a command result as RESP2"""
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, ResponseError):
+        return f'-{value}\r\n'.encode()
+    if isinstance(value, str):
+        return f'+{value}\r\n'.encode()
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return f':{value}\r\n'.encode()
+    if isinstance(value, bytes):
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+    if isinstance(value, list):
+        return b'*%d\r\n' % len(value) + b''.join(encode(item) for item in value)
+    raise TypeError(f'Cannot encode {type(value).__name__}')
+
+
+async def read_command(reader) -> Optional[List[bytes]]:
+    """Parse one RESP array of bulk strings (or an inline command)"""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b'*'):
+        return line.split()
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        length = int(header[1:])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+class RedisStandIn:
+    def __init__(self):
+        self.store = Store()
+
+    async def handle(self, reader, writer):
+        session = Session(self)
+        try:
+            while True:
+                args = await read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                if args[0].upper() == b'QUIT':
+                    writer.write(encode('OK'))
+                    break
+                try:
+                    result = session.execute(args)
+                except ResponseError as e:
+                    result = e
+                except (ValueError, TypeError, IndexError):
+                    result = ResponseError('ERR syntax error')
+                writer.write(encode(result))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 6379):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-memory Redis stand-in for local cache testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6379)
+    options = parser.parse_args()
+    print(f'Redis stand-in listening on redis://{options.host}:{options.port}')
+    try:
+        asyncio.run(RedisStandIn().serve(options.host, options.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+JSON renderer and parser on orjson, used as the REST_FRAMEWORK defaults.
+
+orjson encodes dicts, lists, strings, numbers, datetimes and UUIDs
+natively. Everything else (Decimal, lazy strings, querysets, ...) goes
+through DRF's encoder, so the output matches the stock JSONRenderer.
+orjson is optional. Without it, and for indented output or payloads
+orjson rejects (e.g. non-string dict keys), both classes fall back to
+the stdlib json path of their DRF base classes. orjson writes NaN and
+infinities as null where the stock renderer raises (STRICT_JSON) or
+writes NaN/Infinity, so payloads holding them take the stock path too.
+"""
+import math
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+# orjson is optional: the stdlib json module is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# datetimes in UTC end in "Z", like DRF's encoder
+ORJSON_OPTIONS = orjson.OPT_UTC_Z if orjson is not None else 0
+
+# U+2028/U+2029 are valid JSON but not valid JavaScript; DRF escapes them
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def fast_json_available() -> bool:
+    return orjson is not None
+
+
+def has_non_finite_float(data) -> bool:
+    """Whether a NaN or infinity is nested anywhere in lists/tuples/dicts of `data`"""
+    pending = [data]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            pending.extend(item)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer encoding with orjson.
+
+    Only the compact, non-ASCII-escaping output of the default DRF settings
+    (COMPACT_JSON, UNICODE_JSON) takes the fast path.
+    """
+
+    _default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Non-finite floats come out as null; only payloads with a null can hold one
+        if b'null' in ret and has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if b'\xe2\x80' in ret:
+            for raw, escaped in LINE_SEPARATORS:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser decoding with orjson (UTF-8 request bodies only)"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
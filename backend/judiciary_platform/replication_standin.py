@@ -0,0 +1,71 @@
+"""
+Replication stand-in for trying read replicas with SQLite files:
+
+    python -m judiciary_platform.replication_standin db.sqlite3 db_replica.sqlite3 --lag 1
+
+Polls the primary and, after each change, copies it into every replica with
+SQLite's online backup API (a consistent snapshot; replica readers keep
+their snapshot while it is written). --lag delays each copy to imitate
+replication lag. Not for production: whole-file copies, no failover.
+"""
+import argparse
+import sqlite3
+import time
+from typing import List
+
+
+class ReplicationStandIn:
+    def __init__(self, primary: str, replicas: List[str], interval: float = 0.2, lag: float = 0.0):
+        self.primary = primary
+        self.replicas = replicas
+        self.interval = interval
+        self.lag = lag
+        self.copies = 0
+
+    def replicate(self, source: sqlite3.Connection):
+        for path in self.replicas:
+            target = sqlite3.connect(path, timeout=30)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        self.copies += 1
+
+    def run(self, once: bool = False):
+        source = sqlite3.connect(self.primary, timeout=30)
+        try:
+            # data_version changes whenever another connection commits
+            last_version = None
+            while True:
+                version = source.execute('PRAGMA data_version').fetchone()[0]
+                if version != last_version:
+                    if last_version is not None and self.lag:
+                        time.sleep(self.lag)
+                    started = time.monotonic()
+                    self.replicate(source)
+                    print(f'Replicated to {len(self.replicas)} replica(s) in {time.monotonic() - started:.3f}s')
+                    last_version = version
+                if once:
+                    return
+                time.sleep(self.interval)
+        finally:
+            source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Copy a primary SQLite database to replica files on change')
+    parser.add_argument('primary')
+    parser.add_argument('replicas', nargs='+')
+    parser.add_argument('--interval', type=float, default=0.2, help='Seconds between change checks')
+    parser.add_argument('--lag', type=float, default=0.0, help='Seconds to wait before applying a change')
+    parser.add_argument('--once', action='store_true', help='Copy once and exit')
+    options = parser.parse_args()
+    print(f'Replicating {options.primary} -> {", ".join(options.replicas)}')
+    try:
+        ReplicationStandIn(options.primary, options.replicas, options.interval, options.lag).run(options.once)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
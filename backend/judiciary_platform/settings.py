@@ -46,6 +46,8 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
+    # Outstanding/blacklisted token tables for rotation and logout
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
 ]
 
@@ -60,11 +62,14 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # First, so its latency covers the whole middleware chain
+    'judiciary_platform.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'judiciary_platform.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'judiciary_platform.db_router.ReplicaRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -91,47 +96,125 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'judiciary_platform.wsgi.application'
 
-# Database
-# Use SQLite for development/testing (easier setup)
+# Database profile: DB_ENGINE selects sqlite (default, a WAL-mode local
+# file), mysql or postgresql (DB_NAME/DB_USER/... from the environment).
+# Connections are kept open for DB_CONN_MAX_AGE seconds instead of one per
+# request, and checked before reuse so a dropped connection is replaced
+# rather than failing the request.
+#
+# Pooling for MySQL/PostgreSQL: each worker thread holds at most one
+# persistent connection, so size the server's max_connections for
+# processes x threads. For more workers than the server allows, put
+# PgBouncer (transaction pooling) or ProxySQL in front, set DB_CONN_MAX_AGE
+# to 0 and, for PgBouncer, DB_DISABLE_SERVER_SIDE_CURSORS=True.
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DATABASE_PROFILES = {
+    'sqlite': {
+        # django.db.backends.sqlite3 plus per-connection pragmas
+        'ENGINE': 'judiciary_platform.db_backends.sqlite3',
+        'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+        'OPTIONS': {
+            'pragmas': {
+                'journal_mode': 'WAL',  # Readers don't wait for the writer
+                'synchronous': 'NORMAL',
+                'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int),
+                'cache_size': -config('SQLITE_CACHE_SIZE_KB', default=65536, cast=int),  # Negative = KiB
+                'temp_store': 'MEMORY',
+            },
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    'mysql': {
+        'ENGINE': 'django.db.backends.mysql',
+        'NAME': config('DB_NAME', default='judiciary_platform'),
+        'USER': config('DB_USER', default='root'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='3306'),
+        'OPTIONS': {
+            'sql_mode': 'traditional',
+            'charset': 'utf8mb4',
+            'isolation_level': 'read committed',
+        },
+    },
+    'postgresql': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default='judiciary_platform'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
+    },
+}
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **DATABASE_PROFILES[DB_ENGINE],
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
-# Uncomment below for MySQL in production
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.mysql',
-#         'NAME': config('DB_NAME', default='judiciary_platform'),
-#         'USER': config('DB_USER', default='root'),
-#         'PASSWORD': config('DB_PASSWORD', default=''),
-#         'HOST': config('DB_HOST', default='localhost'),
-#         'PORT': config('DB_PORT', default='3306'),
-#         'OPTIONS': {
-#             'sql_mode': 'traditional',
-#         }
-#     }
-# }
-
-# Cache configuration (using dummy cache for development)
+# Read replicas (judiciary_platform.db_router): DB_REPLICAS lists one
+# SQLite file or database host per replica, added as aliases replica1, ...
+# Reads of REPLICA_READ_MODELS go to them; a user who wrote reads from the
+# primary for REPLICA_STICKY_SECONDS (keep it above the replication lag).
+# Try it locally with two SQLite files:
+#   DB_REPLICAS=db_replica.sqlite3
+#   python -m judiciary_platform.replication_standin db.sqlite3 db_replica.sqlite3
+DB_REPLICAS = config('DB_REPLICAS', default='', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+DATABASE_REPLICAS = []
+for index, target in enumerate(DB_REPLICAS, 1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME' if DB_ENGINE == 'sqlite' else 'HOST': target,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{index}')
+DATABASE_ROUTERS = ['judiciary_platform.db_router.ReplicaRouter']
+REPLICA_READ_MODELS = ['lawyers.lawyer', 'lawyers.case', 'accounts.customuser']
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# Cache configuration: CACHE_BACKEND selects local memory (default, per
+# process), a shared file cache, Redis (needs the `redis` package; try it
+# locally with `python -m judiciary_platform.redis_standin`) or dummy
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'judiciary-platform',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+    },
+    'dummy': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int),
+        'KEY_PREFIX': config('CACHE_KEY_PREFIX', default='judiciary'),
     }
 }
 
-# Uncomment below for Redis in production
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django_redis.cache.RedisCache',
-#         'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
-#         'OPTIONS': {
-#             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-#         }
-#     }
-# }
+# Response cache TTLs in seconds (see judiciary_platform.caching); entries are
+# also invalidated by model signals, the TTL only bounds missed invalidations
+CACHE_TTLS = {
+    'lawyer_profile': config('CACHE_TTL_LAWYER_PROFILE', default=300, cast=int),
+    'lawyer_search': config('CACHE_TTL_LAWYER_SEARCH', default=60, cast=int),
+    'verification_status': config('CACHE_TTL_VERIFICATION_STATUS', default=30, cast=int),
+    'user_profile': config('CACHE_TTL_USER_PROFILE', default=300, cast=int),
+}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -173,16 +256,31 @@ AUTH_USER_MODEL = 'accounts.CustomUser'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt's JWTAuthentication, minus the per-request user query
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON (judiciary_platform.renderers), stdlib json without it
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'judiciary_platform.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'judiciary_platform.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Token buckets (judiciary_platform.throttling): burst size / refill period
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': config('THROTTLE_AUTH_IP', default='20/min'),
+        'login_email': config('THROTTLE_LOGIN_EMAIL', default='5/min'),
+        'register_email': config('THROTTLE_REGISTER_EMAIL', default='5/min'),
+        'account': config('THROTTLE_ACCOUNT', default='120/min'),
+        'verification': config('THROTTLE_VERIFICATION', default='10/hour'),
+    },
     # 'DEFAULT_FILTER_BACKENDS': [
     #     'django_filters.rest_framework.DjangoFilterBackend',
     #     'rest_framework.filters.SearchFilter',
@@ -196,6 +294,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.tokens.FilteredTokenRefreshSerializer',
     'UPDATE_LAST_LOGIN': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
@@ -242,6 +341,59 @@ CORS_ALLOWED_HEADERS = [
 # OCR Configuration
 TESSERACT_CMD = config('TESSERACT_CMD', default=None)  # Path to tesseract executable if needed
 
+# Queue certificate OCR for `manage.py run_ocr_worker` instead of running it in the request
+OCR_ASYNC_PROCESSING = config('OCR_ASYNC_PROCESSING', default=True, cast=bool)
+OCR_WORKER_PROCESSES = config('OCR_WORKER_PROCESSES', default=2, cast=int)
+OCR_JOB_MAX_ATTEMPTS = config('OCR_JOB_MAX_ATTEMPTS', default=3, cast=int)
+OCR_JOB_STALE_SECONDS = config('OCR_JOB_STALE_SECONDS', default=300, cast=int)  # Requeue jobs of crashed workers
+# Image preprocessing before tesseract (see lawyers.preprocessing.DEFAULT_PREPROCESSING)
+OCR_PREPROCESSING = {
+    'enabled': config('OCR_PREPROCESSING_ENABLED', default=True, cast=bool),
+    'target_dpi': config('OCR_TARGET_DPI', default=300, cast=int),
+    'binarize': True,
+    'deskew': True,
+    'crop_to_text': config('OCR_CROP_TO_TEXT', default=False, cast=bool),
+}
+# PDF certificates: rasterization DPI and the most pages read before giving up
+OCR_PDF_DPI = config('OCR_PDF_DPI', default=200, cast=int)
+OCR_PDF_MAX_PAGES = config('OCR_PDF_MAX_PAGES', default=5, cast=int)
+OCR_RESULT_CACHE_MAX_ENTRIES = config('OCR_RESULT_CACHE_MAX_ENTRIES', default=5000, cast=int)  # LRU-evicted beyond this
+
+# Password hashing pool for login/registration (accounts.hashing): at most
+# WORKERS hashes run at once, beyond WORKERS + MAX_QUEUE requests get a 503
+PASSWORD_HASHING_WORKERS = config('PASSWORD_HASHING_WORKERS', default=min(4, os.cpu_count() or 1), cast=int)
+PASSWORD_HASHING_MAX_QUEUE = config('PASSWORD_HASHING_MAX_QUEUE', default=64, cast=int)
+
+# Rate limit bucket store: 'memory' (per process, no shared state) or
+# 'cache' (RATE_LIMIT_CACHE_ALIAS, shared when the cache is file or Redis)
+RATE_LIMIT_STORE = config('RATE_LIMIT_STORE', default='memory')
+RATE_LIMIT_CACHE_ALIAS = config('RATE_LIMIT_CACHE_ALIAS', default='default')
+
+# Bloom filter in front of the refresh token blacklist (accounts.blacklist).
+# Sized for CAPACITY blacklisted tokens at ERROR_RATE false positives; prune
+# expired tokens with `manage.py prune_token_blacklist` (e.g. from cron).
+# Only used with a shared CACHE_BACKEND (file, redis); with locmem every
+# refresh/logout checks the blacklist table
+TOKEN_BLACKLIST_FILTER_CAPACITY = config('TOKEN_BLACKLIST_FILTER_CAPACITY', default=100000, cast=int)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = config('TOKEN_BLACKLIST_FILTER_ERROR_RATE', default=0.01, cast=float)
+TOKEN_BLACKLIST_FILTER_MAX_STALENESS = config('TOKEN_BLACKLIST_FILTER_MAX_STALENESS', default=5.0, cast=float)  # Seconds
+
+# Mock DigiLocker client. InProcessTransport answers immediately;
+# lawyers.digilocker.HTTPTransport talks to `manage.py run_digilocker_standin`
+DIGILOCKER_TRANSPORT = config('DIGILOCKER_TRANSPORT', default='lawyers.digilocker.InProcessTransport')
+DIGILOCKER_URL = config('DIGILOCKER_URL', default='http://127.0.0.1:8765/verify')
+DIGILOCKER_TIMEOUT = config('DIGILOCKER_TIMEOUT', default=2.0, cast=float)  # Seconds per attempt
+DIGILOCKER_MAX_RETRIES = config('DIGILOCKER_MAX_RETRIES', default=2, cast=int)
+DIGILOCKER_BREAKER_THRESHOLD = config('DIGILOCKER_BREAKER_THRESHOLD', default=5, cast=int)  # Consecutive failures
+DIGILOCKER_BREAKER_RESET_SECONDS = config('DIGILOCKER_BREAKER_RESET_SECONDS', default=30, cast=int)
+
+# Lawyer search index backend (dotted path). Empty selects SQLite FTS5 on
+# SQLite and the portable icontains backend on other databases.
+LAWYER_SEARCH_BACKEND = config('LAWYER_SEARCH_BACKEND', default='')
+
+# Upper bound for the opt-in search total count (larger results report an estimate)
+LAWYER_SEARCH_COUNT_CAP = config('LAWYER_SEARCH_COUNT_CAP', default=1000, cast=int)
+
 # Email Configuration for Verification Notifications
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -255,7 +407,31 @@ DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@judiciaryplat
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
-# Logging
+# Same as Django's defaults, but each file gets a SHA-256 `content_hash` while streaming
+FILE_UPLOAD_HANDLERS = [
+    'lawyers.uploadhandlers.HashingMemoryFileUploadHandler',
+    'lawyers.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
+# Request metrics (judiciary_platform.metrics), served at /api/admin/metrics/
+# to admins or to scrapers sending METRICS_TOKEN as X-Metrics-Token.
+# Rolling percentiles cover the last METRICS_WINDOW requests per URL name
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_WINDOW = config('METRICS_WINDOW', default=1024, cast=int)
+
+# Logging: loggers hand records to a bounded in-memory queue
+# (judiciary_platform.logging_pipeline); a background thread writes them in
+# batches to the console and to logs/django.log as JSON lines. The file is
+# rotated at LOG_MAX_BYTES or every LOG_ROTATE_SECONDS and old files are
+# gzipped. LOG_FILE_FORMAT=verbose switches the file back to plain text.
+# One process writes logs/django.log; other processes (extra gunicorn
+# workers) write logs/django.<pid>.log, so no file is rotated by two writers.
+LOG_FILE_FORMAT = config('LOG_FILE_FORMAT', default='json')
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=10, cast=int)
+LOG_ROTATE_SECONDS = config('LOG_ROTATE_SECONDS', default=24 * 60 * 60, cast=int)
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)  # Records beyond this are dropped
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -268,37 +444,56 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'judiciary_platform.logging_pipeline.JSONFormatter',
+        },
     },
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'judiciary_platform.logging_pipeline.CompressingRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'django.log',
-            'formatter': 'verbose',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
+            'interval': LOG_ROTATE_SECONDS,
+            'encoding': 'utf-8',
+            'formatter': LOG_FILE_FORMAT,
         },
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        'queue': {
+            '()': 'judiciary_platform.logging_pipeline.queue_handler',
+            'sink': 'judiciary_platform.log_sink',
+            'maxsize': LOG_QUEUE_SIZE,
+        },
     },
     'root': {
-        'handlers': ['console', 'file'],
+        'handlers': ['queue'],
         'level': 'INFO',
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False,
         },
         'judiciary_platform': {
-            'handlers': ['console', 'file'],
+            'handlers': ['queue'],
             'level': 'DEBUG',
             'propagate': False,
         },
+        # Not logged to: holds the handlers the queue listener writes to
+        'judiciary_platform.log_sink': {
+            'handlers': ['console', 'file'],
+            'propagate': False,
+        },
     },
 }
+# dictConfig, then start the queue listener on the sink's handlers
+LOGGING_CONFIG = 'judiciary_platform.logging_pipeline.configure_logging'
 
 # Create logs directory
 os.makedirs(BASE_DIR / 'logs', exist_ok=True)
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Token bucket throttles for DRF.
+
+Buckets use GCRA (generic cell rate algorithm): each key stores a single
+"theoretical arrival time", so a check is one read and one write with no
+history list. A rate of 'N/period' allows bursts of N requests and refills
+one token every period / N.
+
+Stores (RATE_LIMIT_STORE setting):
+- 'memory' (default): a per-process dict. Updates are plain dict reads and
+  writes, atomic under the GIL, with no lock; racing threads can at worst
+  each spend the same token, so a burst may exceed N by the number of
+  concurrent threads.
+- 'cache': Django's cache, shared between processes (file or Redis backends).
+  The read-modify-write of a key runs under a per-key lock taken with
+  cache.add(), so concurrent requests cannot spend the same token. add() is
+  atomic on Redis and memcached; the file backend checks and writes in two
+  steps, so there a burst may still exceed N by the number of concurrent
+  processes. A request that cannot get the lock is throttled.
+"""
+import math
+import time
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class MemoryBucketStore:
+    """Lock-free in-process GCRA store (see module docstring)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._sweep_at = max_keys
+        self._arrivals = {}
+
+    def take(self, key: str, capacity: int, interval: float) -> Tuple[bool, float]:
+        """Spend one token for `key`, returns (allowed, seconds until a token is available)"""
+        now = time.monotonic()
+        arrival = max(self._arrivals.get(key, now), now)
+        excess = arrival - now - (capacity - 1) * interval
+        if excess > 0:
+            return False, excess
+        self._arrivals[key] = arrival + interval
+        if len(self._arrivals) > self._sweep_at:
+            self._sweep(now)
+        return True, 0.0
+
+    def _sweep(self, now: float):
+        # Keys whose bucket has refilled completely carry no state
+        for key, arrival in list(self._arrivals.items()):
+            if arrival <= now:
+                self._arrivals.pop(key, None)
+        # Many live keys (e.g. a distributed burst): back off instead of sweeping every request
+        self._sweep_at = max(self.max_keys, 2 * len(self._arrivals))
+
+    def clear(self):
+        self._arrivals.clear()
+
+
+class CacheBucketStore:
+    """GCRA state in the Django cache, shared by every process using it"""
+
+    # Seconds a lock is held at most if its holder dies, and lock retries
+    lock_timeout = 1
+    lock_attempts = 20
+    lock_wait = 0.005
+
+    def __init__(self, alias: str = 'default'):
+        self.alias = alias
+
+    def take(self, key: str, capacity: int, interval: float) -> Tuple[bool, float]:
+        cache = caches[self.alias]
+        lock_key = f'{key}:lock'
+        for _ in range(self.lock_attempts):
+            if cache.add(lock_key, 1, self.lock_timeout):
+                try:
+                    return self._take(cache, key, capacity, interval)
+                finally:
+                    cache.delete(lock_key)
+            time.sleep(self.lock_wait)
+        # Heavy contention on one key: deny rather than risk over-admitting
+        return False, interval
+
+    def _take(self, cache, key: str, capacity: int, interval: float) -> Tuple[bool, float]:
+        now = time.time()
+        arrival = max(cache.get(key, now), now)
+        excess = arrival - now - (capacity - 1) * interval
+        if excess > 0:
+            return False, excess
+        # Expire once the bucket would be full again
+        cache.set(key, arrival + interval, math.ceil(arrival + interval - now))
+        return True, 0.0
+
+    def clear(self):
+        pass
+
+
+_store = None
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        if getattr(settings, 'RATE_LIMIT_STORE', 'memory') == 'cache':
+            _store = CacheBucketStore(getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', 'default'))
+        else:
+            _store = MemoryBucketStore()
+    return _store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with a token bucket instead of a request history.
+
+    Subclasses set `scope` (rate from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
+    and implement get_cache_key(); returning None skips throttling.
+    """
+
+    cache_format = 'ratelimit:%(scope)s:%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = get_bucket_store().take(
+            self.key, self.num_requests, self.duration / self.num_requests
+        )
+        return allowed
+
+    def wait(self) -> Optional[float]:
+        return self.wait_seconds or None
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """Per client IP, for unauthenticated auth endpoints"""
+
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailThrottle(TokenBucketThrottle):
+    """Per submitted email, so rotating IPs cannot hammer one account"""
+
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not email or not isinstance(email, str):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': email.strip().lower()}
+
+
+class RegisterEmailThrottle(LoginEmailThrottle):
+    """Per email on sign-up, in its own bucket so registrations do not use up logins"""
+
+    scope = 'register_email'
+
+
+class UserScopedThrottle(TokenBucketThrottle):
+    """Per authenticated user, falling back to the client IP"""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class AccountThrottle(UserScopedThrottle):
+    scope = 'account'
+
+
+class VerificationThrottle(UserScopedThrottle):
+    """lawyers/verify/* endpoints: OCR and DigiLocker work is expensive"""
+
+    scope = 'verification'
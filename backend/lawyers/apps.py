@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class LawyersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lawyers'
-    verbose_name = 'Lawyers'
\ No newline at end of file
+    verbose_name = 'Lawyers'
+    
+    def ready(self):
+        # Register signal handlers
+        from . import signals  # noqa: F401
+        from .search import create_search_index
+        
+        # The FTS table is not a model, so it is created after migrate
+        post_migrate.connect(create_search_index, sender=self)
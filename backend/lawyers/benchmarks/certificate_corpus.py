@@ -0,0 +1,177 @@
+"""
+Sample OCR output of lawyer certificates with the expected field values.
+
+Texts mimic tesseract output (--oem 3 --psm 6) of real enrolment
+certificates, including typical noise: stray punctuation, odd casing and
+header lines that mention the same keywords.
+"""
+
+CERTIFICATE_CORPUS = [
+    {
+        'text': (
+            "BAR COUNCIL OF DELHI\n"
+            "Certificate of Enrolment\n"
+            "This is to certify that\n"
+            "Name: Rajesh Kumar Sharma\n"
+            "Enrolment No: D/1234/2010\n"
+            "Date of Enrolment: 15/03/2010\n"
+            "is enrolled as an Advocate on the roll of the Bar Council of Delhi.\n"
+        ),
+        'expected': {
+            'name': 'Rajesh Kumar Sharma',
+            'bar_id': 'D/1234/2010',
+            'registration_date': '15/03/2010',
+            'state_bar_council': 'DELHI',
+        },
+    },
+    {
+        'text': (
+            "Maharashtra Bar Council\n"
+            "Advocate Priya S. Nair\n"
+            "Bar Council Registration No. MAH/5678/2015\n"
+            "Registered on 01-07-2015\n"
+        ),
+        'expected': {
+            'name': 'Priya S. Nair',
+            'bar_id': 'MAH/5678/2015',
+            'registration_date': '01-07-2015',
+            'state_bar_council': 'Maharashtra',
+        },
+    },
+    {
+        'text': (
+            "THE BAR COUNCIL OF TAMIL NADU AND PUDUCHERRY\n"
+            "CERTIFICATE OF ENROLLMENT\n"
+            "Shri Arun Venkatesh\n"
+            "Enrollment Number : TN/0987/2008\n"
+            "Enrollment Date: 22/11/2008\n"
+        ),
+        'expected': {
+            'name': 'Arun Venkatesh',
+            'bar_id': 'TN/0987/2008',
+            'registration_date': '22/11/2008',
+            'state_bar_council': 'TAMIL NADU AND PUDUCHERRY',
+        },
+    },
+    {
+        'text': (
+            "Karnataka State Bar Council\n"
+            "Smt. Lakshmi Devi Rao\n"
+            "Registration No: KAR/4411/2012\n"
+            "Registration Date 05/06/2012\n"
+        ),
+        'expected': {
+            'name': 'Lakshmi Devi Rao',
+            'bar_id': 'KAR/4411/2012',
+            'registration_date': '05/06/2012',
+            'state_bar_council': 'Karnataka State',
+        },
+    },
+    {
+        'text': (
+            "Bar Council of Kerala\n"
+            "Name : Thomas Mathew\n"
+            "Enrolment No. K/776/1999\n"
+            "Date of Registration : 12-01-1999\n"
+            "State: Kerala\n"
+        ),
+        'expected': {
+            'name': 'Thomas Mathew',
+            'bar_id': 'K/776/1999',
+            'registration_date': '12-01-1999',
+            'state_bar_council': 'Kerala',
+        },
+    },
+    {
+        'text': (
+            "Gujarat Bar Council\n"
+            "Mr. Harsh Patel\n"
+            "BAR/G/3321/2018\n"
+            "Date of Enrollment: 9/8/2018\n"
+        ),
+        'expected': {
+            'name': 'Harsh Patel',
+            'bar_id': 'G/3321/2018',
+            'registration_date': '9/8/2018',
+            'state_bar_council': 'Gujarat',
+        },
+    },
+    {
+        'text': (
+            "BAR COUNCIL OF UTTAR PRADESH , ALLAHABAD\n"
+            "Name:- Mohd. Imran Khan\n"
+            "Enrolment No: UP/10234/2016\n"
+            "Date of Enrolment : 30/09/2016\n"
+        ),
+        'expected': {
+            'name': 'Mohd. Imran Khan',
+            'bar_id': 'UP/10234/2016',
+            'registration_date': '30/09/2016',
+            'state_bar_council': 'UTTAR PRADESH',
+        },
+    },
+    {
+        'text': (
+            "West Bengal Bar Council\n"
+            "Ms. Ananya Chatterjee\n"
+            "Registration Number: WB/2020/551\n"
+            "Registered on: 14-02-2020\n"
+        ),
+        'expected': {
+            'name': 'Ananya Chatterjee',
+            'bar_id': 'WB/2020/551',
+            'registration_date': '14-02-2020',
+            'state_bar_council': 'West Bengal',
+        },
+    },
+    {
+        'text': (
+            "Punjab & Haryana Bar Council\n"
+            "Certificate\n"
+            "Advocate Gurpreet Singh Gill\n"
+            "Enrolment No P/1456/2011\n"
+        ),
+        'expected': {
+            'name': 'Gurpreet Singh Gill',
+            'bar_id': 'P/1456/2011',
+            'state_bar_council': 'Punjab & Haryana',
+        },
+    },
+    {
+        'text': (
+            "Rajasthan Bar Council\n"
+            "Name Vikram Singh Rathore\n"
+            "Bar Council Registration Number R/889/2005\n"
+            "Date of Registration 03/04/2005\n"
+        ),
+        'expected': {
+            'name': 'Vikram Singh Rathore',
+            'bar_id': 'R/889/2005',
+            'registration_date': '03/04/2005',
+            'state_bar_council': 'Rajasthan',
+        },
+    },
+    {
+        'text': (
+            "Scanned copy - poor quality\n"
+            "N4me: ???\n"
+            "Enro1ment No: \n"
+        ),
+        'expected': {},
+    },
+    {
+        'text': (
+            "BAR COUNCIL OF ANDHRA PRADESH\n"
+            "ENROLMENT CERTIFICATE\n"
+            "NAME: SRINIVAS REDDY K\n"
+            "ENROLMENT NO: AP/2233/2014\n"
+            "DATE OF ENROLMENT: 18-12-2014\n"
+        ),
+        'expected': {
+            'name': 'SRINIVAS REDDY K',
+            'bar_id': 'AP/2233/2014',
+            'registration_date': '18-12-2014',
+            'state_bar_council': 'ANDHRA PRADESH',
+        },
+    },
+]
@@ -0,0 +1,139 @@
+"""
+Synthetic dataset for API load tests (`manage.py seed_benchmark_data`).
+
+Rows are generated from a seeded RNG, so the same arguments always give
+the same data, and inserted with bulk_create. Signals do not fire, so the
+derived state (case counters, search index, caches) is rebuilt at the end.
+Every seeded account shares one password, hashed once.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from judiciary_platform.caching import invalidate
+from lawyers.models import Case, Lawyer, LawyerVerification
+from lawyers.search import get_search_backend
+
+# Seeded accounts are named bench-<role>-<n>@bench.local
+EMAIL_DOMAIN = 'bench.local'
+
+FIRST_NAMES = [
+    'Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Meera', 'Arjun', 'Kavya', 'Rahul', 'Sneha',
+    'Aditya', 'Isha', 'Karan', 'Divya', 'Nikhil', 'Pooja', 'Sanjay', 'Neha', 'Amit', 'Riya',
+]
+LAST_NAMES = [
+    'Sharma', 'Verma', 'Iyer', 'Nair', 'Reddy', 'Gupta', 'Mehta', 'Kapoor', 'Joshi', 'Rao',
+    'Patel', 'Singh', 'Das', 'Menon', 'Pillai', 'Bose', 'Kulkarni', 'Chopra', 'Bhat', 'Khan',
+]
+SPECIALIZATIONS = [
+    'Criminal Law', 'Civil Law', 'Corporate Law', 'Family Law', 'Property Law',
+    'Labor Law', 'Tax Law', 'Constitutional Law', 'Intellectual Property', 'General Practice',
+]
+LOCATIONS = [
+    'Delhi', 'Mumbai', 'Bengaluru', 'Chennai', 'Kolkata', 'Hyderabad', 'Pune', 'Ahmedabad',
+    'Jaipur', 'Lucknow', 'Kochi', 'Chandigarh',
+]
+COURTS = ['District Court', 'High Court', 'Sessions Court', 'Family Court', 'Consumer Forum']
+
+
+def bench_email(role: str, index: int) -> str:
+    return f'bench-{role}-{index}@{EMAIL_DOMAIN}'
+
+
+def dataset_exists() -> bool:
+    return CustomUser.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists()
+
+
+def clear_dataset():
+    """Delete everything a previous seed created (cascades to lawyers, cases, verifications)"""
+    return CustomUser.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()[0]
+
+
+def _name(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def seed_dataset(users: int, lawyers: int, cases_per_lawyer: int, verifications: int,
+                 password: str, seed: int = 1, batch_size: int = 1000) -> Dict[str, int]:
+    """Insert the dataset, returns row counts per model"""
+    rng = random.Random(seed)
+    password_hash = make_password(password)
+    now = timezone.now()
+
+    with transaction.atomic():
+        accounts = []
+        for role, count in (('user', users), ('lawyer', lawyers)):
+            for index in range(count):
+                first_name, last_name = _name(rng)
+                accounts.append(CustomUser(
+                    username=f'bench_{role}_{index}', email=bench_email(role, index), password=password_hash,
+                    first_name=first_name, last_name=last_name, role=role,
+                ))
+        CustomUser.objects.bulk_create(accounts, batch_size=batch_size)
+
+        lawyer_users = CustomUser.objects.filter(
+            email__endswith=f'@{EMAIL_DOMAIN}', role='lawyer'
+        ).order_by('id').values_list('id', flat=True)
+        Lawyer.objects.bulk_create([
+            Lawyer(
+                user_id=user_id,
+                bar_id=f'BENCH/{index}/{2000 + index % 24}',
+                specialization=rng.choice(SPECIALIZATIONS),
+                location=rng.choice(LOCATIONS),
+                experience_years=rng.randint(0, 35),
+                # Most profiles are verified, like a live directory
+                is_verified=rng.random() < 0.8,
+                verification_date=now,
+                bio=f'{rng.choice(SPECIALIZATIONS)} practitioner in {rng.choice(LOCATIONS)}.',
+                consultation_fee=rng.choice([500, 1000, 1500, 2500, 5000]),
+            )
+            for index, user_id in enumerate(lawyer_users)
+        ], batch_size=batch_size)
+
+        lawyer_ids = list(Lawyer.objects.filter(
+            user__email__endswith=f'@{EMAIL_DOMAIN}'
+        ).values_list('id', flat=True))
+        case_types = [choice for choice, _ in Case.CASE_TYPES]
+        outcomes = [choice for choice, _ in Case.OUTCOMES]
+        cases = []
+        for lawyer_id in lawyer_ids:
+            for index in range(cases_per_lawyer):
+                filed = date(2015, 1, 1) + timedelta(days=rng.randint(0, 3500))
+                outcome = rng.choice(outcomes)
+                cases.append(Case(
+                    lawyer_id=lawyer_id, title=f'Case {lawyer_id}-{index}', description='Synthetic case',
+                    case_type=rng.choice(case_types), outcome=outcome, date_filed=filed,
+                    date_resolved=None if outcome == 'ongoing' else filed + timedelta(days=rng.randint(30, 900)),
+                    court_name=rng.choice(COURTS),
+                ))
+            if len(cases) >= batch_size:
+                Case.objects.bulk_create(cases, batch_size=batch_size)
+                cases = []
+        Case.objects.bulk_create(cases, batch_size=batch_size)
+
+        statuses = ['pending'] * 3 + ['approved', 'rejected', 'processing']
+        LawyerVerification.objects.bulk_create([
+            LawyerVerification(
+                lawyer_id=rng.choice(lawyer_ids), method=rng.choice(['ocr', 'mock_digilocker', 'manual']),
+                status=rng.choice(statuses), confidence_score=rng.choice(['low', 'medium', 'high']),
+                extracted_data={'name': 'Synthetic', 'bar_id': f'BENCH/{index}'},
+            )
+            for index in range(verifications if lawyer_ids else 0)
+        ], batch_size=batch_size)
+
+        Lawyer.rebuild_case_counters(lawyer_ids=lawyer_ids)
+        get_search_backend().rebuild()
+        for namespace in ('lawyer_profile', 'lawyer_search', 'verification_status', 'user_profile'):
+            invalidate(namespace)
+
+    return {
+        'users': users + lawyers,
+        'lawyers': len(lawyer_ids),
+        'cases': len(lawyer_ids) * cases_per_lawyer,
+        'verifications': verifications if lawyer_ids else 0,
+    }
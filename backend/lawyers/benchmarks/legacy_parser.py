@@ -0,0 +1,55 @@
+"""
+Reference implementation of the original per-pattern certificate parser.
+
+Kept only as a baseline for `manage.py benchmark_certificate_parser`: the
+pattern dict is rebuilt on every call and each pattern runs its own
+re.search over the whole text. Escapes are corrected (the original used
+double-escaped `\\s`, which never matched real whitespace) so the accuracy
+comparison is meaningful.
+"""
+import re
+from typing import Dict
+
+
+def legacy_parse(text: str) -> Dict[str, str]:
+    patterns = {
+        'name': [
+            r'Name\s*:?\s*([A-Za-z\s\.]+?)(?:\n|$)',
+            r'Advocate\s+([A-Za-z\s\.]+?)(?:\n|$)',
+            r'Mr\.?\s*([A-Za-z\s\.]+?)(?:\n|$)',
+            r'Ms\.?\s*([A-Za-z\s\.]+?)(?:\n|$)',
+            r'Shri\s+([A-Za-z\s\.]+?)(?:\n|$)',
+            r'Smt\.?\s*([A-Za-z\s\.]+?)(?:\n|$)'
+        ],
+        'bar_id': [
+            r'Bar\s+(?:Council\s+)?(?:Registration\s+)?(?:No\.?|Number)\s*:?\s*([A-Z0-9\/\-]+)',
+            r'Registration\s+(?:No\.?|Number)\s*:?\s*([A-Z0-9\/\-]+)',
+            r'Enrolment\s+(?:No\.?|Number)\s*:?\s*([A-Z0-9\/\-]+)',
+            r'Enrollment\s+(?:No\.?|Number)\s*:?\s*([A-Z0-9\/\-]+)',
+            r'(?:BAR|Bar)\s*[/\-]?\s*([A-Z0-9\/\-]+)',
+        ],
+        'registration_date': [
+            r'Date\s+of\s+(?:Registration|Enrolment|Enrollment)\s*:?\s*(\d{1,2}[\-\/]\d{1,2}[\-\/]\d{2,4})',
+            r'Registered\s+on\s*:?\s*(\d{1,2}[\-\/]\d{1,2}[\-\/]\d{2,4})',
+            r'(?:Registration|Enrolment|Enrollment)\s+Date\s*:?\s*(\d{1,2}[\-\/]\d{1,2}[\-\/]\d{2,4})'
+        ],
+        'state_bar_council': [
+            r'([A-Za-z\s]+)\s+Bar\s+Council',
+            r'State\s*:?\s*([A-Za-z\s]+)',
+            r'Bar\s+Council\s+of\s+([A-Za-z\s]+)'
+        ]
+    }
+
+    parsed_info = {}
+    for field, field_patterns in patterns.items():
+        for pattern in field_patterns:
+            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            if match:
+                extracted_value = match.group(1).strip()
+                extracted_value = re.sub(r'\s+', ' ', extracted_value)
+                extracted_value = extracted_value.strip('.,;:')
+
+                if extracted_value and len(extracted_value) > 1:
+                    parsed_info[field] = extracted_value
+                    break
+    return parsed_info
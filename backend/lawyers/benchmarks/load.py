@@ -0,0 +1,333 @@
+"""
+Scenario-based HTTP load generator for `manage.py run_load_test`.
+
+Worker threads each hold one keep-alive connection to the server and run
+their scenario in a loop until the deadline. Only the standard library is
+used for HTTP, so a run needs nothing beyond the server itself.
+
+Queries per request are not visible from the client; they are read from
+the server's /api/admin/metrics/ counters before and after the run. Those
+counters are per process, so run the server with a single process
+(runserver, or one worker with threads) for accurate numbers.
+"""
+import http.client
+import io
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from .certificate_corpus import CERTIFICATE_CORPUS
+from .dataset import LOCATIONS, SPECIALIZATIONS
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+SEARCH_ORDERINGS = ['experience', 'newest', 'win_rate']
+
+SEARCH_TERMS = ['law', 'criminal', 'corporate', 'family', 'Sharma', 'Iyer', 'Priya', 'Arjun', 'property']
+
+# Lines of the metrics endpoint's counters, e.g.
+# judiciary_db_queries_total{endpoint="lawyers:search_lawyers"} 12
+COUNTER_LINE = re.compile(r'^judiciary_(db_queries_total|http_requests_total)\{endpoint="([^"]*)"\} (\S+)$', re.MULTILINE)
+
+
+def percentile(sorted_values: List[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    last = len(sorted_values) - 1
+    return sorted_values[min(last, round(quantile * last))]
+
+
+class EndpointStats:
+    """Samples of one endpoint from one worker"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.ok = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def merge(self, other: 'EndpointStats'):
+        self.latencies.extend(other.latencies)
+        self.ok += other.ok
+        self.throttled += other.throttled
+        self.errors += other.errors
+
+
+class Client:
+    """One keep-alive connection; records every request under its endpoint name"""
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        self.stats: Dict[str, EndpointStats] = {}
+        self.access_token: Optional[str] = None
+
+    def request(self, endpoint: str, method: str, path: str, body: bytes = None,
+                headers: Dict[str, str] = None, auth: bool = True):
+        """Returns (status, parsed JSON or None); status 0 means the connection failed"""
+        headers = dict(headers or {})
+        if auth and self.access_token:
+            headers['Authorization'] = f'Bearer {self.access_token}'
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            self.connection.close()
+            stats.errors += 1
+            return 0, None
+        stats.latencies.append(time.perf_counter() - started)
+
+        if 200 <= response.status < 300:
+            stats.ok += 1
+        elif response.status == 429:
+            stats.throttled += 1
+        else:
+            stats.errors += 1
+        try:
+            return response.status, json.loads(payload) if payload else None
+        except ValueError:
+            return response.status, None
+
+    def get(self, endpoint: str, path: str, params: Dict = None, **kwargs):
+        if params:
+            path = f'{path}?{urlencode(params)}'
+        return self.request(endpoint, 'GET', path, **kwargs)
+
+    def post_json(self, endpoint: str, path: str, data: Dict, **kwargs):
+        return self.request(endpoint, 'POST', path, body=json.dumps(data).encode(),
+                            headers={'Content-Type': 'application/json'}, **kwargs)
+
+    def close(self):
+        self.connection.close()
+
+
+def certificate_image(serial: int) -> bytes:
+    """A PNG certificate from the corpus; the serial makes every upload's hash distinct"""
+    from PIL import Image, ImageDraw
+
+    sample = CERTIFICATE_CORPUS[serial % len(CERTIFICATE_CORPUS)]
+    lines = sample['text'].splitlines() + [f'Ref: {serial}']
+    image = Image.new('L', (900, 40 + 28 * len(lines)), color=255)
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((30, 20 + 28 * index), line, fill=0)
+    output = io.BytesIO()
+    image.save(output, format='PNG')
+    return output.getvalue()
+
+
+def multipart(field: str, filename: str, content: bytes, content_type: str):
+    boundary = uuid.uuid4().hex
+    body = b''.join([
+        f'--{boundary}\r\n'.encode(),
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode(),
+        f'Content-Type: {content_type}\r\n\r\n'.encode(),
+        content,
+        f'\r\n--{boundary}--\r\n'.encode(),
+    ])
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+class ScenarioContext:
+    """What workers share: credentials of the seeded accounts and an upload counter"""
+
+    def __init__(self, password: str, user_emails: List[str], user_tokens: List[str], lawyer_tokens: List[str]):
+        self.password = password
+        self.user_emails = user_emails
+        self.user_tokens = user_tokens
+        self.lawyer_tokens = lawyer_tokens
+        self.uploads = itertools.count()
+
+
+def search_heavy(client: Client, context: ScenarioContext, rng: random.Random):
+    """Signed-in users browsing the directory: filtered searches, a few pages deep"""
+    client.access_token = rng.choice(context.user_tokens)
+    params = {'ordering': rng.choice(SEARCH_ORDERINGS)}
+    roll = rng.random()
+    if roll < 0.4:
+        params = {'q': rng.choice(SEARCH_TERMS)}
+    elif roll < 0.6:
+        params['specialization'] = rng.choice(SPECIALIZATIONS)
+    elif roll < 0.8:
+        params['location'] = rng.choice(LOCATIONS)
+    if rng.random() < 0.3:
+        params['min_experience'] = rng.choice([2, 5, 10])
+
+    for _ in range(rng.randint(1, 3)):
+        status, payload = client.get('lawyers:search_lawyers', '/api/lawyers/search/', params)
+        if status != 200 or not payload or not payload.get('next_cursor'):
+            break
+        params = dict(params, cursor=payload['next_cursor'], ordering=payload['ordering'])
+
+    if rng.random() < 0.2:
+        client.access_token = rng.choice(context.lawyer_tokens)
+        client.get('lawyers:get_profile', '/api/lawyers/profile/')
+        client.get('lawyers:verification_status', '/api/lawyers/verification/status/')
+
+
+def login_storm(client: Client, context: ScenarioContext, rng: random.Random):
+    """Logins by seeded users (password hashing bound), then their profile"""
+    status, payload = client.post_json('accounts:login', '/api/auth/login/', {
+        'email': rng.choice(context.user_emails),
+        'password': context.password,
+    }, auth=False)
+    if status == 200 and payload:
+        client.access_token = payload['tokens']['access']
+        client.get('accounts:get_profile', '/api/auth/profile/')
+
+
+def ocr_upload(client: Client, context: ScenarioContext, rng: random.Random):
+    """Seeded lawyers uploading certificates, then polling their status"""
+    serial = next(context.uploads)
+    body, content_type = multipart('certificate', f'certificate-{serial}.png', certificate_image(serial), 'image/png')
+    client.access_token = rng.choice(context.lawyer_tokens)
+    client.request('lawyers:verify_ocr', 'POST', '/api/lawyers/verify/ocr/', body=body,
+                   headers={'Content-Type': content_type})
+    client.get('lawyers:verification_status', '/api/lawyers/verification/status/')
+
+
+def mixed(client: Client, context: ScenarioContext, rng: random.Random):
+    """Roughly production-shaped traffic: mostly search, some logins, few uploads"""
+    roll = rng.random()
+    if roll < 0.8:
+        search_heavy(client, context, rng)
+    elif roll < 0.97:
+        login_storm(client, context, rng)
+    else:
+        ocr_upload(client, context, rng)
+
+
+SCENARIOS: Dict[str, Callable] = {
+    'search_heavy': search_heavy,
+    'login_storm': login_storm,
+    'ocr_upload': ocr_upload,
+    'mixed': mixed,
+}
+
+
+def scrape_query_counters(base_url: str, token: str) -> Optional[Dict[str, Dict[str, float]]]:
+    """{endpoint: {'db_queries_total': n, 'http_requests_total': n}}, None if unavailable"""
+    client = Client(base_url)
+    try:
+        client.connection.request('GET', '/api/admin/metrics/', headers={'X-Metrics-Token': token})
+        response = client.connection.getresponse()
+        text = response.read().decode()
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        client.close()
+    if response.status != 200:
+        return None
+    counters = {}
+    for name, endpoint, value in COUNTER_LINE.findall(text):
+        counters.setdefault(endpoint, {})[name] = float(value)
+    return counters
+
+
+def run_load(base_url: str, scenario: str, context: ScenarioContext, concurrency: int,
+             duration: float, seed: int = 1, metrics_token: str = '') -> Dict:
+    """Run `scenario` from `concurrency` threads for `duration` seconds, returns the report"""
+    step = SCENARIOS[scenario]
+    before = scrape_query_counters(base_url, metrics_token) if metrics_token else None
+    deadline = time.monotonic() + duration
+    stop = threading.Event()
+
+    def worker(index: int) -> Dict[str, EndpointStats]:
+        rng = random.Random(seed * 1000 + index)
+        client = Client(base_url)
+        try:
+            while not stop.is_set() and time.monotonic() < deadline:
+                step(client, context, rng)
+        finally:
+            client.close()
+        return client.stats
+
+    started = time.perf_counter()
+    merged: Dict[str, EndpointStats] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='load') as executor:
+        futures = [executor.submit(worker, index) for index in range(concurrency)]
+        try:
+            for future in futures:
+                for endpoint, stats in future.result().items():
+                    merged.setdefault(endpoint, EndpointStats()).merge(stats)
+        except BaseException:
+            stop.set()
+            raise
+    elapsed = time.perf_counter() - started
+
+    after = scrape_query_counters(base_url, metrics_token) if metrics_token else None
+    return build_report(scenario, concurrency, elapsed, merged, before, after)
+
+
+def build_report(scenario: str, concurrency: int, elapsed: float, merged: Dict[str, EndpointStats],
+                 before: Optional[Dict], after: Optional[Dict]) -> Dict:
+    endpoints = {}
+    for endpoint, stats in sorted(merged.items()):
+        latencies = sorted(stats.latencies)
+        entry = {
+            'requests': stats.ok + stats.throttled + stats.errors,
+            'ok': stats.ok,
+            'throttled': stats.throttled,
+            'errors': stats.errors,
+            'rps': round(stats.ok / elapsed, 2) if elapsed else 0.0,
+        }
+        for quantile in QUANTILES:
+            entry[f'p{round(quantile * 100)}_ms'] = round(percentile(latencies, quantile) * 1000, 2)
+        entry['queries_per_request'] = None
+        if before is not None and after is not None and endpoint in after:
+            old = before.get(endpoint, {})
+            requests = after[endpoint].get('http_requests_total', 0) - old.get('http_requests_total', 0)
+            queries = after[endpoint].get('db_queries_total', 0) - old.get('db_queries_total', 0)
+            if requests > 0:
+                entry['queries_per_request'] = round(queries / requests, 2)
+        endpoints[endpoint] = entry
+
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 2),
+        'total_requests': sum(entry['requests'] for entry in endpoints.values()),
+        'rps': round(sum(entry['ok'] for entry in endpoints.values()) / elapsed, 2) if elapsed else 0.0,
+        'endpoints': endpoints,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Regressions of `report` against a stored report of the same scenario:
+    p95 latency or queries per request up, or throughput down, by more
+    than `tolerance` (a fraction). Endpoints missing from either side and
+    endpoints with errors are reported too.
+    """
+    regressions = []
+    if baseline.get('scenario') != report['scenario']:
+        return [f"baseline is for scenario {baseline.get('scenario')!r}, not {report['scenario']!r}"]
+
+    for endpoint, base in baseline.get('endpoints', {}).items():
+        current = report['endpoints'].get(endpoint)
+        if current is None:
+            regressions.append(f'{endpoint}: no requests in this run')
+            continue
+        if current['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {current['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if current['rps'] < base['rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {current['rps']} req/s vs baseline {base['rps']} req/s")
+        base_queries, queries = base.get('queries_per_request'), current.get('queries_per_request')
+        # Query counts are deterministic per request shape; allow only rounding noise
+        if base_queries is not None and queries is not None and queries > base_queries * (1 + tolerance) + 0.5:
+            regressions.append(f'{endpoint}: {queries} queries/request vs baseline {base_queries}')
+        if current['errors'] > base.get('errors', 0):
+            regressions.append(f"{endpoint}: {current['errors']} errors vs baseline {base.get('errors', 0)}")
+    return regressions
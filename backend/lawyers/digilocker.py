@@ -0,0 +1,327 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class DigiLockerError(Exception):
+    """DigiLocker request failed"""
+
+    # Transient failures (timeouts, 5xx, connection errors) are retried
+    retryable = True
+
+
+class DigiLockerRejected(DigiLockerError):
+    """DigiLocker answered with a client error; retrying will not help"""
+
+    retryable = False
+
+
+class DigiLockerUnavailable(DigiLockerError):
+    """The circuit breaker is open, the request was not attempted"""
+
+    retryable = False
+
+
+def build_mock_certificate(lawyer_data: Dict) -> Dict:
+    """Certificate payload returned by the mock DigiLocker for the submitted details"""
+    return {
+        'name': lawyer_data.get('name', 'Demo Lawyer'),
+        'bar_id': f"BAR/{lawyer_data.get('bar_id', '12345')}/2023",
+        'registration_date': '2020-01-15',
+        'state_bar_council': lawyer_data.get('state', 'Delhi') + ' Bar Council',
+        'status': 'Active',
+        'specialization': lawyer_data.get('specialization', 'General Practice'),
+        'confidence': 'high',
+        'demo_mode': True
+    }
+
+
+class BaseTransport:
+    """
+    How DigiLockerClient reaches the service. `request` is a coroutine so
+    waiting on the remote end never blocks a thread.
+    """
+
+    async def request(self, payload: Dict) -> Dict:
+        raise NotImplementedError
+
+
+class InProcessTransport(BaseTransport):
+    """
+    Answers in-process without any I/O (the default demo behaviour).
+
+    Optional simulated latency uses asyncio.sleep, never time.sleep.
+    """
+
+    def __init__(self, latency_ms: float = 0, failure_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+
+    async def request(self, payload):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise DigiLockerError('Simulated DigiLocker failure')
+        return build_mock_certificate(payload)
+
+
+class HTTPTransport(BaseTransport):
+    """
+    Minimal asyncio HTTP/1.1 JSON client (stdlib only), used against the
+    stand-in server from `manage.py run_digilocker_standin`.
+    """
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.path = parts.path or '/'
+
+    async def request(self, payload):
+        body = json.dumps(payload).encode()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f'POST {self.path} HTTP/1.1\r\n'
+                f'Host: {self.host}:{self.port}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                'Connection: close\r\n\r\n'.encode() + body
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+        head, _, response_body = response.partition(b'\r\n\r\n')
+        try:
+            status_code = int(head.split(b' ', 2)[1])
+        except (IndexError, ValueError):
+            raise DigiLockerError('Malformed response from DigiLocker')
+
+        if status_code >= 500:
+            raise DigiLockerError(f'DigiLocker returned HTTP {status_code}')
+        if status_code >= 400:
+            raise DigiLockerRejected(f'DigiLocker rejected the request (HTTP {status_code})')
+        try:
+            return json.loads(response_body)
+        except ValueError:
+            raise DigiLockerError('Malformed response from DigiLocker')
+
+
+class CircuitBreaker:
+    """
+    Stops calling DigiLocker after `failure_threshold` consecutive failures.
+
+    While open, calls fail fast for `reset_timeout` seconds; then a single
+    trial call is let through (half-open) and its outcome closes or reopens
+    the circuit. Shared by all requests in the process, hence the lock.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class DigiLockerClient:
+    """
+    Timeouts, retries with full-jitter exponential backoff and a circuit
+    breaker around a pluggable transport.
+    """
+
+    def __init__(self, transport: BaseTransport, timeout: float = 2.0, max_retries: int = 2,
+                 backoff_base: float = 0.1, backoff_max: float = 1.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.transport = transport
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2**attempt)]"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def verify(self, payload: Dict) -> Dict:
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow_request():
+                raise DigiLockerUnavailable('DigiLocker is temporarily unavailable')
+            try:
+                result = await asyncio.wait_for(self.transport.request(payload), self.timeout)
+            except asyncio.TimeoutError:
+                last_error = DigiLockerError(f'DigiLocker did not respond within {self.timeout}s')
+            except (ConnectionError, OSError) as e:
+                last_error = DigiLockerError(f'Could not reach DigiLocker: {e}')
+            except DigiLockerError as e:
+                last_error = e
+            else:
+                self.breaker.record_success()
+                return result
+
+            if not last_error.retryable:
+                # The service answered, so it is up
+                self.breaker.record_success()
+                raise last_error
+            self.breaker.record_failure()
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff(attempt))
+        raise last_error
+
+
+_client = None
+
+
+def get_digilocker_client() -> DigiLockerClient:
+    """
+    Process-wide client configured from the DIGILOCKER_* settings, so the
+    circuit breaker state is shared between requests.
+    """
+    global _client
+    if _client is None:
+        transport_path = getattr(settings, 'DIGILOCKER_TRANSPORT', 'lawyers.digilocker.InProcessTransport')
+        transport_class = import_string(transport_path)
+        if issubclass(transport_class, HTTPTransport):
+            transport = transport_class(settings.DIGILOCKER_URL)
+        else:
+            transport = transport_class()
+        _client = DigiLockerClient(
+            transport,
+            timeout=getattr(settings, 'DIGILOCKER_TIMEOUT', 2.0),
+            max_retries=getattr(settings, 'DIGILOCKER_MAX_RETRIES', 2),
+            breaker=CircuitBreaker(
+                failure_threshold=getattr(settings, 'DIGILOCKER_BREAKER_THRESHOLD', 5),
+                reset_timeout=getattr(settings, 'DIGILOCKER_BREAKER_RESET_SECONDS', 30),
+            ),
+        )
+    return _client
+
+
+class DigiLockerStandIn:
+    """
+    Local asyncio HTTP server imitating DigiLocker for load tests.
+
+    POST /verify answers with build_mock_certificate() after a simulated
+    latency; a share of requests fail with 503 (`failure_rate`) or never
+    answer (`hang_rate`) to exercise client timeouts. GET /health returns 200.
+    """
+
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100,
+                 failure_rate: float = 0.0, hang_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.hang_rate = hang_rate
+        self.served = 0
+
+    async def _respond(self, writer, status_code: int, reason: str, payload: Dict):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f'HTTP/1.1 {status_code} {reason}\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            'Connection: close\r\n\r\n'.encode() + body
+        )
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            content_length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    content_length = int(value.strip() or 0)
+            body = await reader.readexactly(content_length) if content_length else b''
+
+            if len(request_line) < 2:
+                await self._respond(writer, 400, 'Bad Request', {'error': 'Malformed request'})
+            elif request_line[:2] == ['GET', '/health']:
+                await self._respond(writer, 200, 'OK', {'status': 'ok', 'served': self.served})
+            elif request_line[:2] != ['POST', '/verify']:
+                await self._respond(writer, 404, 'Not Found', {'error': 'Not found'})
+            else:
+                await self._verify(writer, body)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _verify(self, writer, body: bytes):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            await self._respond(writer, 400, 'Bad Request', {'error': 'Invalid JSON'})
+            return
+
+        latency = max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms))
+        await asyncio.sleep(latency / 1000)
+        self.served += 1
+
+        roll = random.random()
+        if roll < self.hang_rate:
+            # Hold the connection open until the client gives up
+            await asyncio.sleep(3600)
+        elif roll < self.hang_rate + self.failure_rate:
+            await self._respond(writer, 503, 'Service Unavailable', {'error': 'Simulated outage'})
+        else:
+            await self._respond(writer, 200, 'OK', build_mock_certificate(payload))
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
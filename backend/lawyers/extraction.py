@@ -0,0 +1,179 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+
+class FieldRule(NamedTuple):
+    """
+    One way of extracting a certificate field.
+
+    `pattern` is matched at the position of the trigger keyword. Normally the
+    value is its first group; for `value_before` rules the pattern only
+    confirms the trigger and the value is the text preceding it on the line.
+    """
+    field: str
+    priority: int
+    pattern: Pattern
+    value_before: bool = False
+
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Values stay on one line: [ \t] rather than \s
+_SEP = r'[ \t]*[:\-]*[ \t]*'
+_PERSON = r'([A-Za-z][A-Za-z \t.]*?)[ \t]*$'
+_NUMBER = r'[ \t]*(?:No\.?|Number)' + _SEP + r'(?-i:([A-Z0-9/\-]+))'
+_DATE = r'(\d{1,2}[\-/]\d{1,2}[\-/]\d{2,4})'
+_PLACE = r'([A-Za-z][A-Za-z \t&]*?)[ \t]*(?:[,;(]|$)'
+
+# trigger keyword -> rules tried at that keyword (priority: lower wins, as in
+# the original pattern order for each field)
+TRIGGER_RULES: Dict[str, List[FieldRule]] = {
+    'name': [
+        FieldRule('name', 0, re.compile(r'Name' + _SEP + _PERSON, _FLAGS)),
+    ],
+    'advocate': [
+        FieldRule('name', 1, re.compile(r'Advocate[ \t]+' + _PERSON, _FLAGS)),
+    ],
+    'mr': [
+        FieldRule('name', 2, re.compile(r'Mr\.?[ \t]*' + _PERSON, _FLAGS)),
+    ],
+    'ms': [
+        FieldRule('name', 3, re.compile(r'Ms\.?[ \t]*' + _PERSON, _FLAGS)),
+    ],
+    'shri': [
+        FieldRule('name', 4, re.compile(r'Shri[ \t]+' + _PERSON, _FLAGS)),
+    ],
+    'smt': [
+        FieldRule('name', 5, re.compile(r'Smt\.?[ \t]*' + _PERSON, _FLAGS)),
+    ],
+    'bar': [
+        FieldRule('bar_id', 0, re.compile(
+            r'Bar[ \t]+(?:Council[ \t]+)?(?:Registration[ \t]+)?' + _NUMBER, _FLAGS)),
+        # Bare "BAR/12345/2010" style ids must contain a digit
+        FieldRule('bar_id', 4, re.compile(
+            r'Bar[ \t]*[/\-]?[ \t]*(?-i:([A-Z0-9/\-]*\d[A-Z0-9/\-]*))', _FLAGS)),
+        # "Maharashtra Bar Council" header lines only, not prose mentioning the council
+        FieldRule('state_bar_council', 0, re.compile(r'Bar[ \t]+Council[ \t]*$', _FLAGS), value_before=True),
+        FieldRule('state_bar_council', 2, re.compile(r'Bar[ \t]+Council[ \t]+of[ \t]+' + _PLACE, _FLAGS)),
+    ],
+    'registration': [
+        FieldRule('bar_id', 1, re.compile(r'Registration' + _NUMBER, _FLAGS)),
+        FieldRule('registration_date', 2, re.compile(r'Registration[ \t]+Date' + _SEP + _DATE, _FLAGS)),
+    ],
+    'enrolment': [
+        FieldRule('bar_id', 2, re.compile(r'Enrolment' + _NUMBER, _FLAGS)),
+        FieldRule('registration_date', 2, re.compile(r'Enrolment[ \t]+Date' + _SEP + _DATE, _FLAGS)),
+    ],
+    'enrollment': [
+        FieldRule('bar_id', 3, re.compile(r'Enrollment' + _NUMBER, _FLAGS)),
+        FieldRule('registration_date', 2, re.compile(r'Enrollment[ \t]+Date' + _SEP + _DATE, _FLAGS)),
+    ],
+    'date': [
+        FieldRule('registration_date', 0, re.compile(
+            r'Date[ \t]+of[ \t]+(?:Registration|Enrolment|Enrollment)' + _SEP + _DATE, _FLAGS)),
+    ],
+    'registered': [
+        FieldRule('registration_date', 1, re.compile(r'Registered[ \t]+on' + _SEP + _DATE, _FLAGS)),
+    ],
+    'state': [
+        FieldRule('state_bar_council', 1, re.compile(r'State' + _SEP + _PLACE, _FLAGS)),
+    ],
+}
+
+FIELDS = ['name', 'bar_id', 'registration_date', 'state_bar_council']
+
+# Worst rule priority still counted as a labelled, high-confidence match
+# ("Name:", "Advocate ..."; any "... No:" number rather than a bare BAR/123 token)
+HIGH_CONFIDENCE_PRIORITY = {
+    'name': 1,
+    'bar_id': 3,
+}
+
+# One scanner for every trigger keyword; the named group says which one hit.
+# Word boundaries sit outside the alternation so the engine checks them once.
+TRIGGER_RE = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<{keyword}>{keyword})' for keyword in TRIGGER_RULES) + r')\b',
+    re.IGNORECASE
+)
+
+# Format checks used by OCRVerificationService.validate_extracted_data
+BAR_ID_FORMAT_RE = re.compile(r'^[A-Z0-9/\-]+$')
+NAME_FORMAT_RE = re.compile(r'^[A-Za-z\s.]+$')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_LINE_PREFIX_RE = re.compile(r'([A-Za-z][A-Za-z \t&]*?)[ \t]*$')
+
+
+def _clean(value: str) -> str:
+    return _WHITESPACE_RE.sub(' ', value).strip().strip('.,;:')
+
+
+class CertificateFieldExtractor:
+    """
+    Single-pass certificate field extractor.
+
+    TRIGGER_RE walks the text once; each keyword hit dispatches (by named
+    group) to the anchored rules for that keyword. Per field the rule with the
+    lowest priority wins, ties going to the earliest occurrence.
+    """
+
+    def __init__(self, trigger_re: Pattern = TRIGGER_RE, trigger_rules=TRIGGER_RULES):
+        self.trigger_re = trigger_re
+        self.trigger_rules = trigger_rules
+        self.best_priorities = {field: 0 for field in FIELDS}
+
+    def extract(self, text: str) -> Dict[str, str]:
+        return {field: value for field, (value, _) in self.extract_detailed(text).items()}
+
+    def extract_detailed(self, text: str) -> Dict[str, Tuple[str, int]]:
+        """Like extract(), but maps each field to (value, priority of the winning rule)"""
+        found: Dict[str, Tuple[str, int]] = {}
+        priorities: Dict[str, int] = {}
+
+        for trigger in self.trigger_re.finditer(text):
+            start = trigger.start()
+            for rule in self.trigger_rules[trigger.lastgroup]:
+                if priorities.get(rule.field, len(FIELDS) + 10) <= rule.priority:
+                    continue
+                match = rule.pattern.match(text, start)
+                if not match:
+                    continue
+                value = self._value(text, start, match, rule)
+                if value:
+                    found[rule.field] = (value, rule.priority)
+                    priorities[rule.field] = rule.priority
+
+            # Every field already has its top-priority value
+            if len(priorities) == len(FIELDS) and priorities == self.best_priorities:
+                break
+
+        return found
+
+    def _value(self, text: str, start: int, match, rule: FieldRule) -> Optional[str]:
+        if rule.value_before:
+            line_start = text.rfind('\n', 0, start) + 1
+            prefix = _LINE_PREFIX_RE.match(text, line_start, start)
+            if not prefix:
+                return None
+            raw = prefix.group(1)
+        else:
+            raw = match.group(1)
+        value = _clean(raw)
+        return value if len(value) > 1 else None
+
+
+_default_extractor = CertificateFieldExtractor()
+
+
+def extract_certificate_fields(text: str) -> Dict[str, str]:
+    """Extract name, bar_id, registration_date and state_bar_council from OCR text"""
+    return _default_extractor.extract(text or '')
+
+
+def has_confident_fields(text: str, fields: Iterable[str] = ('name', 'bar_id')) -> bool:
+    """True when every given field is found by a labelled (high-confidence) rule"""
+    detailed = _default_extractor.extract_detailed(text or '')
+    return all(
+        field in detailed and detailed[field][1] <= HIGH_CONFIDENCE_PRIORITY.get(field, 0)
+        for field in fields
+    )
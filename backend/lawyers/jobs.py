@@ -0,0 +1,166 @@
+import logging
+import os
+import signal
+import socket
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import OCRJob
+from .services import OCRVerificationService, run_certificate_ocr
+
+logger = logging.getLogger('judiciary_platform.ocr_worker')
+
+# Stale claims are looked for this many times per OCR_JOB_STALE_SECONDS
+STALE_CHECKS_PER_TIMEOUT = 10
+
+
+def init_worker_process():
+    """Pool initializer: make Django usable in spawned (non-fork) children"""
+    import django
+    django.setup()
+
+
+class OCRWorker:
+    """
+    Pulls OCR jobs from the database queue and runs them in a process pool.
+
+    The parent process owns all database access (claiming, storing results);
+    pool processes only run the CPU-bound OCR + parsing step.
+    """
+
+    def __init__(self, processes: Optional[int] = None, poll_interval: float = 1.0,
+                 stale_after: Optional[timedelta] = None):
+        self.processes = processes or getattr(settings, 'OCR_WORKER_PROCESSES', os.cpu_count() or 1)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after or timedelta(
+            seconds=getattr(settings, 'OCR_JOB_STALE_SECONDS', 300)
+        )
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stale_checked_at = None
+        self.service = OCRVerificationService()
+        self._stopping = False
+        self.processed = 0
+        self.failed = 0
+
+    def stop(self, *args):
+        """Finish in-flight jobs, then exit"""
+        self._stopping = True
+
+    def _requeue_stale(self):
+        """requeue_stale() at most STALE_CHECKS_PER_TIMEOUT times per stale_after"""
+        now = time.monotonic()
+        interval = self.stale_after.total_seconds() / STALE_CHECKS_PER_TIMEOUT
+        if self._stale_checked_at is not None and now - self._stale_checked_at < interval:
+            return
+        self._stale_checked_at = now
+        requeued, failed = OCRJob.requeue_stale(self.stale_after)
+        if requeued or failed:
+            logger.warning('Stale OCR jobs: %s requeued, %s out of attempts', requeued, failed)
+
+    def _local_path(self, job: OCRJob):
+        """Return (path, is_temp) for the job's document, copying non-local storage to disk"""
+        document = job.verification.uploaded_document
+        try:
+            return document.path, False
+        except NotImplementedError:
+            suffix = os.path.splitext(document.name)[1]
+            temp_fd, temp_path = tempfile.mkstemp(suffix=suffix)
+            with os.fdopen(temp_fd, 'wb') as temp_file, document.open('rb') as source:
+                for chunk in source.chunks():
+                    temp_file.write(chunk)
+            return temp_path, True
+
+    def _finish(self, job: OCRJob, future, temp_path: Optional[str]) -> bool:
+        """Store or fail one finished job, returns False if its pool process died"""
+        try:
+            extracted_text, parsed_info, timings = future.result()
+            self.service.complete_job(job, extracted_text, parsed_info)
+            self.processed += 1
+            logger.info(
+                'OCR job %s done (verification %s), stage timings (ms): %s',
+                job.id, job.verification_id, timings
+            )
+            return True
+        except BrokenProcessPool:
+            # Counts as an attempt: the document may be what kills the process
+            self.service.fail_job(job, 'OCR process exited unexpectedly')
+            self.failed += 1
+            logger.warning('OCR job %s lost its process (attempt %s/%s)', job.id, job.attempts, job.max_attempts)
+            return False
+        except Exception as e:
+            self.service.fail_job(job, str(e))
+            self.failed += 1
+            logger.warning('OCR job %s failed (attempt %s/%s): %s', job.id, job.attempts, job.max_attempts, e)
+            return True
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def run(self, burst: bool = False):
+        """
+        Process jobs until stopped. With `burst`, exit once the queue is drained.
+        """
+        signal.signal(signal.SIGTERM, self.stop)
+
+        while not self._run_pool(burst):
+            # A pool process was killed (OOM, segfault): the pool is unusable
+            logger.warning('OCR process pool broke, starting a new one')
+
+        return self.processed, self.failed
+
+    def _run_pool(self, burst: bool) -> bool:
+        """
+        Run jobs on one process pool. Returns True when done, or False once
+        the pool broke and its in-flight jobs have been failed or released.
+        """
+        in_flight = {}
+        broken = False
+        with ProcessPoolExecutor(max_workers=self.processes, initializer=init_worker_process) as pool:
+            while True:
+                close_old_connections()
+
+                if not self._stopping and not broken:
+                    self._requeue_stale()
+                    while len(in_flight) < self.processes:
+                        job = OCRJob.claim_next(self.worker_id)
+                        if job is None:
+                            break
+                        if self.service.complete_from_cache(job):
+                            self.processed += 1
+                            continue
+                        try:
+                            path, is_temp = self._local_path(job)
+                        except Exception as e:
+                            self.service.fail_job(job, f"Document unavailable: {e}")
+                            self.failed += 1
+                            continue
+                        try:
+                            future = pool.submit(run_certificate_ocr, path)
+                        except BrokenProcessPool:
+                            job.release()
+                            if is_temp:
+                                os.remove(path)
+                            broken = True
+                            break
+                        in_flight[future] = (job, path if is_temp else None)
+
+                if not in_flight:
+                    if broken:
+                        return False
+                    if self._stopping or burst:
+                        return True
+                    time.sleep(self.poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, temp_path = in_flight.pop(future)
+                    if not self._finish(job, future, temp_path):
+                        broken = True
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from lawyers.benchmarks.certificate_corpus import CERTIFICATE_CORPUS
+from lawyers.benchmarks.legacy_parser import legacy_parse
+from lawyers.extraction import FIELDS, extract_certificate_fields
+
+
+class Command(BaseCommand):
+    help = 'Benchmark certificate field extraction throughput and accuracy on the sample corpus'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, default=2000,
+            help='Passes over the corpus used to measure throughput'
+        )
+        parser.add_argument(
+            '--verbose-misses', action='store_true',
+            help='Print every field the single-pass extractor got wrong'
+        )
+    
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        parsers = [
+            ('legacy (per-pattern re.search)', legacy_parse),
+            ('single-pass extractor', extract_certificate_fields),
+        ]
+        
+        self.stdout.write(
+            f"Corpus: {len(CERTIFICATE_CORPUS)} certificates x {iterations} iterations"
+        )
+        self.stdout.write(f"{'parser':<34}{'docs/s':>12}{'us/doc':>10}{'precision':>11}{'recall':>9}")
+        
+        for label, parse in parsers:
+            docs_per_second, micros = self._throughput(parse, iterations)
+            precision, recall, misses = self._accuracy(parse)
+            self.stdout.write(
+                f"{label:<34}{docs_per_second:>12,.0f}{micros:>10.1f}{precision:>11.1%}{recall:>9.1%}"
+            )
+            if options['verbose_misses'] and parse is extract_certificate_fields:
+                for index, field, expected, actual in misses:
+                    self.stdout.write(f"  sample {index} {field}: expected {expected!r}, got {actual!r}")
+    
+    def _throughput(self, parse, iterations):
+        texts = [sample['text'] for sample in CERTIFICATE_CORPUS]
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                parse(text)
+        elapsed = time.perf_counter() - start
+        documents = iterations * len(texts)
+        return documents / elapsed, elapsed / documents * 1_000_000
+    
+    def _accuracy(self, parse):
+        """Field-level precision/recall against the corpus expectations"""
+        correct = extracted = expected_total = 0
+        misses = []
+        for index, sample in enumerate(CERTIFICATE_CORPUS):
+            result = parse(sample['text'])
+            expected = sample['expected']
+            for field in FIELDS:
+                actual = result.get(field)
+                wanted = expected.get(field)
+                if actual is not None:
+                    extracted += 1
+                if wanted is not None:
+                    expected_total += 1
+                if actual is not None and actual == wanted:
+                    correct += 1
+                elif actual != wanted:
+                    misses.append((index, field, wanted, actual))
+        precision = correct / extracted if extracted else 0.0
+        recall = correct / expected_total if expected_total else 0.0
+        return precision, recall, misses
@@ -0,0 +1,78 @@
+import io
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import CustomUser
+from judiciary_platform.renderers import FastJSONParser, FastJSONRenderer, fast_json_available
+from lawyers.views import get_pending_verifications, search_lawyers
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the stock DRF JSON renderer/parser against the orjson-backed ones '
+        'on the largest lawyer payloads (needs data, e.g. from seed_benchmark_data)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per payload and renderer')
+        parser.add_argument('--page-size', type=int, default=100, help='Lawyers per search page')
+
+    def handle(self, *args, **options):
+        if not fast_json_available():
+            raise CommandError('orjson is not installed; FastJSONRenderer would use the stock encoder')
+
+        iterations = options['iterations']
+        payloads = self._payloads(options['page_size'])
+        self.stdout.write(f"{'payload':<28}{'KB':>8}{'stock ms':>10}{'fast ms':>10}{'speedup':>9}  {'parse stock/fast ms':>20}")
+
+        for label, data in payloads:
+            stock = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            if stock != fast:
+                raise CommandError(f'{label}: FastJSONRenderer output differs from JSONRenderer')
+
+            stock_render = self._time(lambda: JSONRenderer().render(data), iterations)
+            fast_render = self._time(lambda: FastJSONRenderer().render(data), iterations)
+            stock_parse = self._time(lambda: JSONParser().parse(io.BytesIO(stock)), iterations)
+            fast_parse = self._time(lambda: FastJSONParser().parse(io.BytesIO(stock)), iterations)
+            self.stdout.write(
+                f"{label:<28}{len(stock) / 1024:>8.1f}{stock_render:>10.3f}{fast_render:>10.3f}"
+                f"{stock_render / fast_render:>8.1f}x  {stock_parse:>9.3f} / {fast_parse:.3f}"
+            )
+
+    def _payloads(self, page_size):
+        """response.data of the largest read endpoints, before rendering"""
+        # The factory's default Host (testserver) is rejected outside tests
+        host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        factory = APIRequestFactory(SERVER_NAME=host, HTTP_HOST=host)
+        user = CustomUser.objects.order_by('id').first()
+        if user is None:
+            raise CommandError('No users found; run seed_benchmark_data first')
+        admin = CustomUser(username='benchmark-admin', role='admin', is_staff=True)
+
+        payloads = []
+        for label, view, path, params, requester in (
+            (f'search ({page_size} lawyers)', search_lawyers, '/api/lawyers/search/',
+             {'page_size': page_size, 'ordering': 'newest'}, user),
+            ('pending verifications', get_pending_verifications, '/api/lawyers/admin/verifications/pending/',
+             {}, admin),
+        ):
+            request = factory.get(path, params)
+            force_authenticate(request, user=requester)
+            response = view(request)
+            if response.status_code != 200:
+                raise CommandError(f'{label}: {path} returned {response.status_code}')
+            payloads.append((label, response.data))
+        return payloads
+
+    def _time(self, function, iterations):
+        """Milliseconds per call"""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        return (time.perf_counter() - start) / iterations * 1000
@@ -0,0 +1,124 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count
+
+from lawyers.models import Case, Lawyer, LawyerVerification
+from lawyers.pagination import LawyerSearchPagination
+
+# A table read without any index, per vendor
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (\w+)$', re.MULTILINE),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'mysql': re.compile(r'Table scan on (\w+)'),
+}
+
+# Index each search ordering should walk (win_rate sorts a computed score)
+SEARCH_ORDERING_INDEXES = {
+    'experience': 'lawyer_verified_exp_idx',
+    'newest': 'lawyer_verified_id_idx',
+}
+
+# MySQL only reports scan types in its tree format
+EXPLAIN_OPTIONS = {
+    'mysql': {'format': 'tree'},
+}
+
+
+def search_queries():
+    """lawyers.views.search_lawyers: every keyset ordering, first and later pages"""
+    pagination = LawyerSearchPagination()
+    for name, (annotations, keys) in pagination.orderings.items():
+        # 'relevance' is served by the search backend's own index (FTS5)
+        if name == 'relevance':
+            continue
+        pagination.keys = keys
+        queryset = Lawyer.objects.filter(is_verified=True).annotate(
+            **annotations
+        ).order_by(*[f'-{field}' if descending else field for field, descending in keys])
+        yield f'search ordering={name}', queryset[:21], SEARCH_ORDERING_INDEXES.get(name)
+        yield f'search ordering={name} min_experience', queryset.filter(experience_years__gte=5)[:21], None
+        yield f'search ordering={name} cursor', queryset.filter(pagination.keyset_filter([1] * len(keys)))[:21], None
+
+
+def hot_queries():
+    """(label, queryset, index the plan must use or None) for the hot queries of lawyers.views"""
+    yield (
+        'pending verifications',
+        LawyerVerification.objects.filter(status='pending').select_related('lawyer__user').order_by('-created_at'),
+        'verif_pending_created_idx',
+    )
+    yield (
+        'verification status',
+        LawyerVerification.objects.filter(lawyer_id=1).order_by('-created_at')[:5],
+        'verif_lawyer_created_idx',
+    )
+    yield 'lawyer profile', Lawyer.objects.filter(user_id=1), None
+    yield from search_queries()
+    yield (
+        'case outcome counts',
+        Case.objects.filter(lawyer_id__in=[1, 2]).order_by().values('lawyer_id', 'outcome').annotate(n=Count('id')),
+        'case_lawyer_outcome_idx',
+    )
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot lawyer queries and fail if any of them scans a table without an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default='default',
+            help='Database alias to check (its schema must be up to date)'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'No plan checks for {connection.vendor}')
+
+        failures = []
+        with transaction.atomic(using=connection.alias):
+            if connection.vendor == 'postgresql':
+                # Tiny or empty tables make a sequential scan the cheapest
+                # plan; the check is about whether an index *can* serve it
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            present = self._index_names(connection)
+
+            for label, queryset, expected in hot_queries():
+                plan = queryset.using(connection.alias).explain(**EXPLAIN_OPTIONS.get(connection.vendor, {}))
+                problems = [f'full scan of {table}' for table in pattern.findall(plan)]
+                if expected and expected in present and expected not in plan:
+                    problems.append(f'does not use {expected}')
+                if expected and expected not in present and self._expects_index(connection, expected):
+                    problems.append(f'index {expected} missing from the database')
+
+                if problems:
+                    failures.append(f'{label}: {", ".join(problems)}')
+                    self.stdout.write(self.style.ERROR(f'FAIL {label}: {", ".join(problems)}'))
+                else:
+                    self.stdout.write(f'ok   {label}')
+                if problems or options['verbosity'] > 1:
+                    self.stdout.write('     ' + plan.replace('\n', '\n     '))
+            transaction.set_rollback(True, using=connection.alias)
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot query plan(s) regressed')
+        self.stdout.write(self.style.SUCCESS('All hot queries use an index'))
+
+    def _index_names(self, connection):
+        names = set()
+        with connection.cursor() as cursor:
+            for model in (Lawyer, LawyerVerification, Case):
+                names.update(connection.introspection.get_constraints(cursor, model._meta.db_table))
+        return names
+
+    def _expects_index(self, connection, name):
+        """False for partial indexes on databases that cannot create them"""
+        for model in (Lawyer, LawyerVerification, Case):
+            for index in model._meta.indexes:
+                if index.name == name:
+                    return index.condition is None or connection.features.supports_partial_indexes
+        return True
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from judiciary_platform.caching import invalidate
+from lawyers.models import Lawyer
+
+
+class Command(BaseCommand):
+    help = 'Rebuild denormalized case outcome counters on Lawyer profiles'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lawyer', type=int, action='append', dest='lawyer_ids',
+            help='Only rebuild counters for this lawyer id (can be repeated)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of lawyer rows written per bulk update'
+        )
+    
+    def handle(self, *args, **options):
+        updated = Lawyer.rebuild_case_counters(
+            lawyer_ids=options['lawyer_ids'],
+            batch_size=options['batch_size']
+        )
+        # bulk_update sends no signals; drop every cached profile and search page
+        invalidate('lawyer_profile')
+        invalidate('lawyer_search')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt case counters for {updated} lawyer(s)'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from lawyers.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the lawyer full-text search index from the lawyer and user tables'
+    
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed} lawyer profile(s) using {backend.__class__.__name__}'
+        ))
@@ -0,0 +1,46 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from lawyers.digilocker import DigiLockerStandIn
+
+
+class Command(BaseCommand):
+    help = 'Run a local DigiLocker stand-in server with simulated latency and failures'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--latency-ms', type=float, default=300,
+            help='Mean response latency in milliseconds'
+        )
+        parser.add_argument(
+            '--jitter-ms', type=float, default=100,
+            help='Latency varies uniformly by up to this many milliseconds'
+        )
+        parser.add_argument(
+            '--failure-rate', type=float, default=0.0,
+            help='Share of requests answered with HTTP 503 (0-1)'
+        )
+        parser.add_argument(
+            '--hang-rate', type=float, default=0.0,
+            help='Share of requests never answered, to trigger client timeouts (0-1)'
+        )
+    
+    def handle(self, *args, **options):
+        standin = DigiLockerStandIn(
+            latency_ms=options['latency_ms'],
+            jitter_ms=options['jitter_ms'],
+            failure_rate=options['failure_rate'],
+            hang_rate=options['hang_rate']
+        )
+        self.stdout.write(
+            f"DigiLocker stand-in listening on http://{options['host']}:{options['port']}/verify "
+            f"(latency {options['latency_ms']}±{options['jitter_ms']}ms, "
+            f"failure rate {options['failure_rate']}, hang rate {options['hang_rate']})"
+        )
+        try:
+            asyncio.run(standin.serve(options['host'], options['port']))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS(f'Stand-in stopped after {standin.served} requests'))
@@ -0,0 +1,115 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import CustomUser
+from lawyers.benchmarks.dataset import EMAIL_DOMAIN
+from lawyers.benchmarks.load import SCENARIOS, ScenarioContext, compare_to_baseline, run_load
+
+COLUMNS = ('requests', 'ok', 'throttled', 'errors', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+
+
+class Command(BaseCommand):
+    help = (
+        'Run a load scenario against a running server seeded with seed_benchmark_data, '
+        'and optionally fail on regressions against a stored baseline. Raise the '
+        'THROTTLE_* rates on the server first or most requests come back 429.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+        parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='search_heavy')
+        parser.add_argument('--concurrency', type=int, default=8, help='Worker threads (one connection each)')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+        parser.add_argument('--password', default='bench-pass-123', help='Password the dataset was seeded with')
+        parser.add_argument('--accounts', type=int, default=500, help='Seeded accounts to spread requests over')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--metrics-token', default=os.environ.get('METRICS_TOKEN', settings.METRICS_TOKEN),
+            help="The server's METRICS_TOKEN, to report DB queries per request"
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--baseline', help='Baseline report (JSON) to compare against')
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Write this run to --baseline instead of comparing'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Allowed relative regression of p95, throughput and queries per request'
+        )
+
+    def handle(self, *args, **options):
+        if options['save_baseline'] and not options['baseline']:
+            raise CommandError('--save-baseline needs --baseline')
+
+        context = self._context(options)
+        self.stdout.write(
+            f"Running {options['scenario']} against {options['url']} "
+            f"with {options['concurrency']} workers for {options['duration']:g}s..."
+        )
+        report = run_load(
+            options['url'], options['scenario'], context,
+            concurrency=options['concurrency'],
+            duration=options['duration'],
+            seed=options['seed'],
+            metrics_token=options['metrics_token'],
+        )
+        self._print_report(report)
+        if not report['total_requests']:
+            raise CommandError('No requests completed; is the server running?')
+
+        if options['output']:
+            self._write(options['output'], report)
+        if options['save_baseline']:
+            self._write(options['baseline'], report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        elif options['baseline']:
+            self._compare(report, options['baseline'], options['tolerance'])
+
+    def _context(self, options):
+        seeded = CustomUser.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').order_by('id')
+        users = list(seeded.filter(role='user')[:options['accounts']])
+        lawyers = list(seeded.filter(role='lawyer', lawyer_profile__isnull=False)[:options['accounts']])
+        if not users or not lawyers:
+            raise CommandError('No benchmark dataset found; run seed_benchmark_data first')
+        # Minted locally so scenarios other than login_storm skip the login cost
+        return ScenarioContext(
+            options['password'],
+            [user.email for user in users],
+            [str(RefreshToken.for_user(user).access_token) for user in users],
+            [str(RefreshToken.for_user(lawyer).access_token) for lawyer in lawyers],
+        )
+
+    def _print_report(self, report):
+        width = max([len('endpoint')] + [len(endpoint) for endpoint in report['endpoints']])
+        self.stdout.write('')
+        self.stdout.write(f"{'endpoint':<{width}}  " + '  '.join(f'{column:>10}' for column in COLUMNS))
+        for endpoint, entry in report['endpoints'].items():
+            values = ['-' if entry[column] is None else entry[column] for column in COLUMNS]
+            self.stdout.write(f'{endpoint:<{width}}  ' + '  '.join(f'{value:>10}' for value in values))
+        self.stdout.write(
+            f"\n{report['total_requests']} requests in {report['duration_seconds']}s, {report['rps']} req/s"
+        )
+
+    def _write(self, path, report):
+        with open(path, 'w') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write('\n')
+
+    def _compare(self, report, path, tolerance):
+        try:
+            with open(path) as handle:
+                baseline = json.load(handle)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+        regressions = compare_to_baseline(report, baseline, tolerance)
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'REGRESSION {regression}'))
+            raise CommandError(f'{len(regressions)} regression(s) against {path}')
+        self.stdout.write(self.style.SUCCESS(f'Within {tolerance:.0%} of baseline {path}'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from lawyers.jobs import OCRWorker
+
+
+class Command(BaseCommand):
+    help = 'Process queued certificate OCR jobs with a local process pool'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help='Number of OCR processes (default: OCR_WORKER_PROCESSES setting)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait between queue polls when idle'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue is empty instead of waiting for new jobs'
+        )
+    
+    def handle(self, *args, **options):
+        worker = OCRWorker(
+            processes=options['processes'],
+            poll_interval=options['poll_interval']
+        )
+        self.stdout.write(f'OCR worker {worker.worker_id} started with {worker.processes} process(es)')
+        try:
+            processed, failed = worker.run(burst=options['burst'])
+        except KeyboardInterrupt:
+            processed, failed = worker.processed, worker.failed
+        self.stdout.write(self.style.SUCCESS(f'OCR worker stopped: {processed} processed, {failed} failed'))
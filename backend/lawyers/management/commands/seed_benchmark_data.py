@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lawyers.benchmarks.dataset import EMAIL_DOMAIN, clear_dataset, dataset_exists, seed_dataset
+
+
+class Command(BaseCommand):
+    help = 'Seed synthetic users, lawyers, cases and verifications for load tests (run_load_test)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Regular user accounts')
+        parser.add_argument('--lawyers', type=int, default=2000, help='Lawyer accounts with profiles')
+        parser.add_argument('--cases-per-lawyer', type=int, default=10)
+        parser.add_argument('--verifications', type=int, default=2000, help='Verification log rows')
+        parser.add_argument(
+            '--password', default='bench-pass-123',
+            help='Password of every seeded account (run_load_test logs in with it)'
+        )
+        parser.add_argument('--seed', type=int, default=1, help='RNG seed; same seed, same data')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete a previously seeded dataset first'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = clear_dataset()
+            self.stdout.write(f'Deleted {deleted} row(s) from a previous seed')
+        elif dataset_exists():
+            raise CommandError(
+                f'A benchmark dataset (@{EMAIL_DOMAIN} accounts) already exists; '
+                'pass --clear to replace it'
+            )
+
+        start = time.perf_counter()
+        counts = seed_dataset(
+            users=options['users'],
+            lawyers=options['lawyers'],
+            cases_per_lawyer=options['cases_per_lawyer'],
+            verifications=options['verifications'],
+            password=options['password'],
+            seed=options['seed'],
+        )
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {summary} in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Lawyer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bar_id', models.CharField(blank=True, max_length=50, null=True, unique=True)),
+                ('specialization', models.CharField(blank=True, max_length=100)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('experience_years', models.PositiveIntegerField(default=0)),
+                ('is_verified', models.BooleanField(default=False)),
+                ('verification_date', models.DateTimeField(blank=True, null=True)),
+                ('bio', models.TextField(blank=True)),
+                ('contact_phone', models.CharField(blank=True, max_length=15)),
+                ('office_address', models.TextField(blank=True)),
+                ('consultation_fee', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('verification_badge_url', models.URLField(blank=True)),
+                ('verification_qr_code', models.ImageField(blank=True, null=True, upload_to='verification_qr/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='lawyer_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lawyer',
+                'verbose_name_plural': 'Lawyers',
+                'db_table': 'lawyers_lawyer',
+            },
+        ),
+        migrations.CreateModel(
+            name='LawyerVerification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(choices=[('ocr', 'OCR Document Processing'), ('mock_digilocker', 'Mock DigiLocker (Demo)'), ('manual', 'Manual Verification'), ('email_phone', 'Email + Phone Verification'), ('blockchain', 'Blockchain Verification')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('expired', 'Expired')], default='pending', max_length=10)),
+                ('extracted_data', models.JSONField(blank=True, null=True)),
+                ('raw_ocr_text', models.TextField(blank=True)),
+                ('uploaded_document', models.FileField(blank=True, null=True, upload_to='verification_docs/')),
+                ('admin_comments', models.TextField(blank=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('confidence_score', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], default='medium', max_length=10)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lawyer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verifications', to='lawyers.lawyer')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_verifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Verification Log',
+                'verbose_name_plural': 'Verification Logs',
+                'db_table': 'lawyers_verificationlog',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Case',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('case_type', models.CharField(choices=[('criminal', 'Criminal Law'), ('civil', 'Civil Law'), ('corporate', 'Corporate Law'), ('family', 'Family Law'), ('property', 'Property Law'), ('labor', 'Labor Law'), ('tax', 'Tax Law'), ('constitutional', 'Constitutional Law'), ('other', 'Other')], max_length=20)),
+                ('outcome', models.CharField(choices=[('won', 'Won'), ('lost', 'Lost'), ('settled', 'Settled'), ('ongoing', 'Ongoing'), ('dismissed', 'Dismissed')], default='ongoing', max_length=10)),
+                ('date_filed', models.DateField()),
+                ('date_resolved', models.DateField(blank=True, null=True)),
+                ('court_name', models.CharField(max_length=100)),
+                ('case_number', models.CharField(blank=True, max_length=50)),
+                ('client_name', models.CharField(blank=True, max_length=100)),
+                ('opposing_party', models.CharField(blank=True, max_length=100)),
+                ('case_value', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('legal_fees', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lawyer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cases', to='lawyers.lawyer')),
+            ],
+            options={
+                'verbose_name': 'Case',
+                'verbose_name_plural': 'Cases',
+                'db_table': 'lawyers_case',
+                'ordering': ['-date_filed'],
+            },
+        ),
+    ]
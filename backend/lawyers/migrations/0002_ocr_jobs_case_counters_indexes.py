@@ -0,0 +1,130 @@
+# Generated by Django 4.2.7 on 2026-10-17 03:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lawyers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('worker_id', models.CharField(blank=True, max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'OCR Job',
+                'verbose_name_plural': 'OCR Jobs',
+                'db_table': 'lawyers_ocrjob',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OCRResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('config_key', models.CharField(max_length=100)),
+                ('raw_text', models.TextField(blank=True)),
+                ('parsed_data', models.JSONField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'OCR Result Cache Entry',
+                'verbose_name_plural': 'OCR Result Cache',
+                'db_table': 'lawyers_ocrresultcache',
+            },
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='dismissed_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='lost_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='ongoing_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='settled_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='total_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyer',
+            name='won_cases',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='lawyerverification',
+            name='document_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='lawyerverification',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('pending', 'Pending Review'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('expired', 'Expired'), ('failed', 'Processing Failed')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['lawyer', 'outcome'], name='case_lawyer_outcome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lawyer',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['-experience_years', '-id'], name='lawyer_verified_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lawyer',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['-id'], name='lawyer_verified_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lawyerverification',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-created_at'], name='verif_pending_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lawyerverification',
+            index=models.Index(fields=['lawyer', '-created_at'], name='verif_lawyer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ocrresultcache',
+            index=models.Index(fields=['last_used_at'], name='ocrresultcache_last_used_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ocrresultcache',
+            constraint=models.UniqueConstraint(fields=('content_hash', 'config_key'), name='ocrresultcache_hash_config_uniq'),
+        ),
+        migrations.AddField(
+            model_name='ocrjob',
+            name='verification',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ocr_job', to='lawyers.lawyerverification'),
+        ),
+        migrations.AddIndex(
+            model_name='ocrjob',
+            index=models.Index(fields=['status', 'id'], name='ocrjob_status_id_idx'),
+        ),
+    ]
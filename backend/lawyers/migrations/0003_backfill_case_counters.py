@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count
+
+# Lawyer.CASE_COUNTER_FIELDS as of this migration
+CASE_COUNTER_FIELDS = {
+    'won': 'won_cases',
+    'lost': 'lost_cases',
+    'settled': 'settled_cases',
+    'ongoing': 'ongoing_cases',
+    'dismissed': 'dismissed_cases',
+}
+
+
+def backfill_case_counters(apps, schema_editor):
+    """Fill the counters added in 0002 from existing cases (Lawyer.rebuild_case_counters)"""
+    Lawyer = apps.get_model('lawyers', 'Lawyer')
+    Case = apps.get_model('lawyers', 'Case')
+
+    counts = {}
+    for row in Case.objects.order_by().values('lawyer_id', 'outcome').annotate(n=Count('id')):
+        counts.setdefault(row['lawyer_id'], {})[row['outcome']] = row['n']
+
+    counter_fields = ['total_cases'] + list(CASE_COUNTER_FIELDS.values())
+    batch = []
+    for lawyer in Lawyer.objects.filter(pk__in=list(counts)).only('pk', *counter_fields).iterator(chunk_size=500):
+        outcome_counts = counts[lawyer.pk]
+        lawyer.total_cases = sum(outcome_counts.values())
+        for outcome, field in CASE_COUNTER_FIELDS.items():
+            setattr(lawyer, field, outcome_counts.get(outcome, 0))
+        batch.append(lawyer)
+        if len(batch) >= 500:
+            Lawyer.objects.bulk_update(batch, counter_fields)
+            batch = []
+    if batch:
+        Lawyer.objects.bulk_update(batch, counter_fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lawyers', '0002_ocr_jobs_case_counters_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_case_counters, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -25,6 +27,15 @@ class Lawyer(models.Model):
     verification_badge_url = models.URLField(blank=True)
     verification_qr_code = models.ImageField(upload_to='verification_qr/', blank=True, null=True)
     
+    # Denormalized case outcome counters (kept in sync by lawyers.signals,
+    # rebuilt with `manage.py rebuild_case_counters`)
+    total_cases = models.PositiveIntegerField(default=0, editable=False)
+    won_cases = models.PositiveIntegerField(default=0, editable=False)
+    lost_cases = models.PositiveIntegerField(default=0, editable=False)
+    settled_cases = models.PositiveIntegerField(default=0, editable=False)
+    ongoing_cases = models.PositiveIntegerField(default=0, editable=False)
+    dismissed_cases = models.PositiveIntegerField(default=0, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -32,24 +43,92 @@ class Lawyer(models.Model):
         db_table = 'lawyers_lawyer'
         verbose_name = 'Lawyer'
         verbose_name_plural = 'Lawyers'
+        indexes = [
+            # Search only reads verified lawyers: keyset on (experience, id) for
+            # the default ordering and on id for 'newest' (MySQL skips partial indexes)
+            models.Index(fields=['-experience_years', '-id'], name='lawyer_verified_exp_idx', condition=Q(is_verified=True)),
+            models.Index(fields=['-id'], name='lawyer_verified_id_idx', condition=Q(is_verified=True)),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.specialization}"
     
-    @property
-    def total_cases(self):
-        return self.cases.count()
+    # Case outcome -> counter field
+    CASE_COUNTER_FIELDS = {
+        'won': 'won_cases',
+        'lost': 'lost_cases',
+        'settled': 'settled_cases',
+        'ongoing': 'ongoing_cases',
+        'dismissed': 'dismissed_cases',
+    }
     
-    @property
-    def won_cases(self):
-        return self.cases.filter(outcome='won').count()
+    def save(self, *args, **kwargs):
+        # The counters only change through F() updates (adjust_case_counters,
+        # rebuild_case_counters). A full save of an instance loaded earlier
+        # would write back stale values and lose concurrent case changes.
+        if not self._state.adding and not args and kwargs.get('update_fields') is None \
+                and not kwargs.get('force_insert'):
+            skipped = set(self.CASE_COUNTER_FIELDS.values()) | {'total_cases'} | self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
     
     @property
     def win_rate(self):
-        total = self.total_cases
-        if total == 0:
+        return self.compute_win_rate(self.won_cases, self.total_cases)
+    
+    @staticmethod
+    def compute_win_rate(won_cases, total_cases):
+        if total_cases == 0:
             return 0
-        return round((self.won_cases / total) * 100, 2)
+        return round((won_cases / total_cases) * 100, 2)
+    
+    @classmethod
+    def adjust_case_counters(cls, lawyer_id, outcome, delta):
+        """
+        Atomically add delta to the total and per-outcome counters.
+        
+        Counters are clamped at zero: a drifted count (rows inserted without
+        signals, before a rebuild) must not make a case delete fail on the
+        unsigned column's CHECK constraint.
+        """
+        updates = {'total_cases': Greatest(F('total_cases') + delta, 0)}
+        outcome_field = cls.CASE_COUNTER_FIELDS.get(outcome)
+        if outcome_field:
+            updates[outcome_field] = Greatest(F(outcome_field) + delta, 0)
+        return cls.objects.filter(pk=lawyer_id).update(**updates)
+    
+    @classmethod
+    def rebuild_case_counters(cls, lawyer_ids=None, batch_size=500):
+        """Recompute counters from the cases table, returns number of lawyers updated"""
+        lawyers = cls.objects.all()
+        cases = Case.objects.all()
+        if lawyer_ids is not None:
+            lawyers = lawyers.filter(pk__in=lawyer_ids)
+            cases = cases.filter(lawyer_id__in=lawyer_ids)
+        
+        # One grouped query for all outcome counts
+        counts = {}
+        for row in cases.order_by().values('lawyer_id', 'outcome').annotate(n=Count('id')):
+            counts.setdefault(row['lawyer_id'], {})[row['outcome']] = row['n']
+        
+        counter_fields = ['total_cases'] + list(cls.CASE_COUNTER_FIELDS.values())
+        updated = 0
+        batch = []
+        for lawyer in lawyers.only('pk', *counter_fields).iterator(chunk_size=batch_size):
+            outcome_counts = counts.get(lawyer.pk, {})
+            lawyer.total_cases = sum(outcome_counts.values())
+            for outcome, field in cls.CASE_COUNTER_FIELDS.items():
+                setattr(lawyer, field, outcome_counts.get(outcome, 0))
+            batch.append(lawyer)
+            if len(batch) >= batch_size:
+                updated += cls.objects.bulk_update(batch, counter_fields)
+                batch = []
+        if batch:
+            updated += cls.objects.bulk_update(batch, counter_fields)
+        return updated
 
 
 class LawyerVerification(models.Model):
@@ -65,10 +144,12 @@ class LawyerVerification(models.Model):
     ]
     
     STATUS_CHOICES = [
+        ('processing', 'Processing'),
         ('pending', 'Pending Review'),
         ('approved', 'Approved'),
         ('rejected', 'Rejected'),
         ('expired', 'Expired'),
+        ('failed', 'Processing Failed'),
     ]
     
     lawyer = models.ForeignKey(Lawyer, on_delete=models.CASCADE, related_name='verifications')
@@ -79,6 +160,7 @@ class LawyerVerification(models.Model):
     extracted_data = models.JSONField(null=True, blank=True)
     raw_ocr_text = models.TextField(blank=True)  # For OCR method
     uploaded_document = models.FileField(upload_to='verification_docs/', null=True, blank=True)
+    document_hash = models.CharField(max_length=64, blank=True, db_index=True)  # SHA-256 of uploaded_document
     
     # Admin review
     admin_comments = models.TextField(blank=True)
@@ -97,6 +179,13 @@ class LawyerVerification(models.Model):
         verbose_name = 'Verification Log'
         verbose_name_plural = 'Verification Logs'
         ordering = ['-created_at']
+        indexes = [
+            # Admin review queue; partial so it only holds the few pending rows
+            # (MySQL has no partial indexes and skips it)
+            models.Index(fields=['-created_at'], name='verif_pending_created_idx', condition=Q(status='pending')),
+            # A lawyer's latest attempts (verification status endpoint)
+            models.Index(fields=['lawyer', '-created_at'], name='verif_lawyer_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.lawyer.user.full_name} - {self.get_method_display()} ({self.status})"
@@ -112,9 +201,11 @@ class LawyerVerification(models.Model):
         # Update lawyer verification status
         self.lawyer.is_verified = True
         self.lawyer.verification_date = timezone.now()
+        update_fields = ['is_verified', 'verification_date', 'updated_at']
         if self.extracted_data and 'bar_id' in self.extracted_data:
             self.lawyer.bar_id = self.extracted_data['bar_id']
-        self.lawyer.save()
+            update_fields.append('bar_id')
+        self.lawyer.save(update_fields=update_fields)
     
     def reject(self, admin_user, comments=""):
         """Reject verification"""
@@ -125,6 +216,154 @@ class LawyerVerification(models.Model):
         self.save()
 
 
+class OCRJob(models.Model):
+    """
+    Queued OCR work for an uploaded certificate, consumed by `manage.py run_ocr_worker`
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    verification = models.OneToOneField(LawyerVerification, on_delete=models.CASCADE, related_name='ocr_job')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    
+    # Claim info for the worker currently processing the job
+    worker_id = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'lawyers_ocrjob'
+        verbose_name = 'OCR Job'
+        verbose_name_plural = 'OCR Jobs'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='ocrjob_status_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"OCR job {self.id} for verification {self.verification_id} ({self.status})"
+    
+    @classmethod
+    def claim_next(cls, worker_id):
+        """
+        Claim the oldest queued job for this worker, returns None if the queue is empty.
+        
+        The claim is a conditional UPDATE, so concurrent workers never get the same job.
+        """
+        # Jobs out of attempts are failed by fail_job/requeue_stale; never run them again
+        queued = cls.objects.filter(status='queued', attempts__lt=F('max_attempts'))
+        candidates = queued.order_by('id').values_list('id', flat=True)[:10]
+        for job_id in candidates:
+            claimed = queued.filter(pk=job_id).update(
+                status='running',
+                worker_id=worker_id,
+                locked_at=timezone.now(),
+                attempts=F('attempts') + 1,
+                updated_at=timezone.now()
+            )
+            if claimed:
+                return cls.objects.select_related('verification__lawyer').get(pk=job_id)
+        return None
+    
+    def release(self):
+        """Give a claimed job back to the queue without counting the attempt"""
+        return OCRJob.objects.filter(pk=self.pk, status='running').update(
+            status='queued',
+            worker_id='',
+            locked_at=None,
+            attempts=Greatest(F('attempts') - 1, 0),
+            updated_at=timezone.now()
+        )
+    
+    @classmethod
+    def requeue_stale(cls, timeout):
+        """
+        Put back jobs whose worker died mid-run (locked longer than `timeout`).
+        
+        Jobs that already used all their attempts (e.g. a document that kills
+        every worker it runs on) are failed instead, with their verification.
+        Returns (requeued, failed).
+        """
+        now = timezone.now()
+        stale = cls.objects.filter(status='running', locked_at__lt=now - timeout)
+        exhausted_ids = list(stale.filter(attempts__gte=F('max_attempts')).values_list('id', flat=True))
+        error = 'OCR worker stopped responding on every attempt'
+        failed = cls.objects.filter(pk__in=exhausted_ids, status='running').update(
+            status='failed', worker_id='', locked_at=None, error_message=error, updated_at=now
+        )
+        # save() per row so the verification status cache is invalidated
+        for verification in LawyerVerification.objects.filter(ocr_job__in=exhausted_ids):
+            verification.status = 'failed'
+            verification.error_message = error
+            verification.save(update_fields=['status', 'error_message', 'updated_at'])
+        
+        requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+            status='queued', worker_id='', locked_at=None, updated_at=now
+        )
+        return requeued, failed
+
+
+class OCRResultCache(models.Model):
+    """
+    OCR output cached by document content hash and OCR/parser configuration
+    """
+    content_hash = models.CharField(max_length=64)
+    config_key = models.CharField(max_length=100)
+    raw_text = models.TextField(blank=True)
+    parsed_data = models.JSONField()
+    
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'lawyers_ocrresultcache'
+        verbose_name = 'OCR Result Cache Entry'
+        verbose_name_plural = 'OCR Result Cache'
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'config_key'], name='ocrresultcache_hash_config_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['last_used_at'], name='ocrresultcache_last_used_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.config_key})"
+    
+    @classmethod
+    def lookup(cls, content_hash, config_key):
+        """Return the cached entry (and mark it recently used) or None"""
+        entry = cls.objects.filter(content_hash=content_hash, config_key=config_key).first()
+        if entry is not None:
+            cls.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=timezone.now())
+        return entry
+    
+    @classmethod
+    def store(cls, content_hash, config_key, raw_text, parsed_data, max_entries=None):
+        """Insert or refresh an entry, evicting least recently used rows beyond max_entries"""
+        entry, _ = cls.objects.update_or_create(
+            content_hash=content_hash,
+            config_key=config_key,
+            defaults={'raw_text': raw_text, 'parsed_data': parsed_data, 'last_used_at': timezone.now()}
+        )
+        
+        if max_entries:
+            overflow = cls.objects.count() - max_entries
+            if overflow > 0:
+                stale_ids = list(cls.objects.order_by('last_used_at').values_list('id', flat=True)[:overflow])
+                cls.objects.filter(pk__in=stale_ids).delete()
+        return entry
+
+
 class Case(models.Model):
     """
     Case model for lawyer case history
@@ -175,6 +414,10 @@ class Case(models.Model):
         verbose_name = 'Case'
         verbose_name_plural = 'Cases'
         ordering = ['-date_filed']
+        indexes = [
+            # Covers the per-lawyer outcome counts (rebuild_case_counters)
+            models.Index(fields=['lawyer', 'outcome'], name='case_lawyer_outcome_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.lawyer.user.full_name}"
@@ -0,0 +1,179 @@
+import base64
+import json
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Q, Value, When
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def approximate_count(queryset, cap: int) -> Tuple[int, bool]:
+    """
+    Count at most `cap` rows, returns (count, is_estimate).
+
+    COUNT over a LIMITed subquery keeps the cost bounded for broad queries;
+    when the cap is hit the caller gets a lower bound instead of an exact total.
+    """
+    count = queryset.order_by()[:cap + 1].count()
+    if count > cap:
+        return cap, True
+    return count, False
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a (sort key, id) tuple.
+
+    Each page is fetched with `WHERE (key, id) < (last_key, last_id)` instead
+    of an OFFSET, so page 100 costs the same as page one. The cursor is an
+    opaque token holding the ordering name and the last row's key values.
+    """
+
+    # name -> (annotations, [(field, descending), ...]); last entry must be unique
+    orderings: Dict[str, Tuple[Dict, List[Tuple[str, bool]]]] = {}
+    default_ordering = None
+
+    page_size = getattr(settings, 'REST_FRAMEWORK', {}).get('PAGE_SIZE', 20)
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    total_query_param = 'include_total'
+    count_cap = 1000
+    results_key = 'results'
+
+    def get_ordering(self, request, default=None) -> str:
+        ordering = request.query_params.get(self.ordering_query_param) or default or self.default_ordering
+        if ordering not in self.orderings:
+            raise ValidationError(f'Invalid ordering. Choose from: {", ".join(self.orderings)}')
+        return ordering
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def encode_cursor(self, values) -> str:
+        payload = json.dumps({'o': self.ordering, 'v': values}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request) -> Optional[list]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            values = payload['v']
+            ordering = payload['o']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound('Invalid cursor')
+        if ordering != self.ordering or len(values) != len(self.keys):
+            raise NotFound('Invalid cursor')
+        return values
+
+    def keyset_filter(self, values) -> Q:
+        """Build (k1, k2, ...) > (v1, v2, ...) honouring each key's direction"""
+        condition = Q()
+        for index, (field, descending) in enumerate(self.keys):
+            lookup = f'{field}__lt' if descending else f'{field}__gt'
+            clause = Q(**{lookup: values[index]})
+            for prior_index, (prior_field, _) in enumerate(self.keys[:index]):
+                clause &= Q(**{prior_field: values[prior_index]})
+            condition |= clause
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None, default_ordering=None):
+        self.request = request
+        self.ordering = self.get_ordering(request, default_ordering)
+        annotations, self.keys = self.orderings[self.ordering]
+        self.page_size = self.get_page_size(request)
+
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        queryset = queryset.order_by(*[
+            f'-{field}' if descending else field for field, descending in self.keys
+        ])
+        # .values() rows must carry the cursor keys even when they are not
+        # rendered. values() without names (empty _fields) already has them all;
+        # values_select alone misses rows of annotations only
+        if queryset._fields:
+            selected = set(queryset.query.values_select) | set(queryset.query.annotation_select)
+            missing = [field for field, _ in self.keys if field not in selected]
+            if missing:
+                queryset = queryset.values(
+                    *queryset.query.values_select, *queryset.query.annotation_select, *missing
+                )
+
+        self.total_count = None
+        self.total_is_estimate = False
+        if request.query_params.get(self.total_query_param, '').lower() in ('1', 'true', 'yes'):
+            self.total_count, self.total_is_estimate = approximate_count(queryset, self.count_cap)
+
+        values = self.decode_cursor(request)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(values))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = rows[-1]
+            # Rows are model instances or .values() dicts
+            if isinstance(last, dict):
+                self.next_cursor = self.encode_cursor([last[field] for field, _ in self.keys])
+            else:
+                self.next_cursor = self.encode_cursor([getattr(last, field) for field, _ in self.keys])
+        return rows
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.ordering_query_param, self.ordering)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            self.results_key: data,
+            'next': self.get_next_link(),
+            'next_cursor': self.next_cursor,
+            'ordering': self.ordering,
+            'page_size': self.page_size,
+        }
+        if self.total_count is not None:
+            payload['total_count'] = self.total_count
+            payload['total_count_is_estimate'] = self.total_is_estimate
+        return Response(payload)
+
+
+class LawyerSearchPagination(KeysetPagination):
+    """
+    Keyset pagination for /api/lawyers/search/
+    """
+
+    orderings = {
+        # search_rank is annotated by lawyers.search backends
+        'relevance': ({}, [('search_rank', False), ('id', False)]),
+        'win_rate': ({
+            'win_rate_score': ExpressionWrapper(
+                Case(
+                    When(total_cases=0, then=Value(0.0)),
+                    default=F('won_cases') * 100.0 / F('total_cases'),
+                ),
+                output_field=FloatField()
+            )
+        }, [('win_rate_score', True), ('id', True)]),
+        'experience': ({}, [('experience_years', True), ('id', True)]),
+        'newest': ({}, [('id', True)]),
+    }
+    default_ordering = 'experience'
+    count_cap = getattr(settings, 'LAWYER_SEARCH_COUNT_CAP', 1000)
+    results_key = 'lawyers'
@@ -0,0 +1,62 @@
+from typing import Iterator, Optional, Tuple
+
+from PIL import Image
+
+# pdf2image (and the poppler utilities it drives) are optional: only PDF
+# certificates need them
+try:
+    from pdf2image import convert_from_path, pdfinfo_from_path
+except ImportError:
+    convert_from_path = None
+    pdfinfo_from_path = None
+
+
+POINTS_PER_INCH = 72
+
+
+def pdf_support_available() -> bool:
+    return convert_from_path is not None
+
+
+def _page_size_points(info) -> Optional[Tuple[float, float]]:
+    """Parse pdfinfo's "Page size: 595.276 x 841.89 pts (A4)" entry"""
+    try:
+        width, _, height = info['Page size'].split()[:3]
+        return float(width), float(height)
+    except (KeyError, ValueError):
+        return None
+
+
+def iter_pdf_pages(path: str, dpi: int = 200, max_pages: Optional[int] = None,
+                   max_pixels_long_side: Optional[int] = None) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Rasterize a PDF one page at a time, yielding (page_number, grayscale image).
+
+    Each page is rendered only when the consumer asks for it, so memory is
+    bounded by a single page and callers can stop early. The DPI is lowered
+    for oversized pages so the long side stays under max_pixels_long_side.
+    """
+    if not pdf_support_available():
+        raise ImportError('PDF certificates require the pdf2image package and poppler-utils')
+
+    info = pdfinfo_from_path(path)
+    page_count = int(info.get('Pages', 1))
+    if max_pages:
+        page_count = min(page_count, max_pages)
+
+    page_size = _page_size_points(info)
+    if page_size and max_pixels_long_side:
+        long_side_inches = max(page_size) / POINTS_PER_INCH
+        dpi = max(1, min(dpi, int(max_pixels_long_side / long_side_inches)))
+
+    for page_number in range(1, page_count + 1):
+        pages = convert_from_path(
+            path,
+            dpi=dpi,
+            first_page=page_number,
+            last_page=page_number,
+            grayscale=True,
+        )
+        if not pages:
+            break
+        yield page_number, pages[0]
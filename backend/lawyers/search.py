@@ -0,0 +1,217 @@
+import re
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q, Value, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Lawyer
+
+
+# Columns indexed for every lawyer profile, in FTS column order
+SEARCH_COLUMNS = ['name', 'specialization', 'location', 'bio']
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split free text into search tokens"""
+    return _TOKEN_RE.findall(text or '')
+
+
+class BaseSearchBackend:
+    """
+    Interface for lawyer search index backends
+    """
+
+    def filter_queryset(self, queryset, terms: Dict[str, str]):
+        """
+        Restrict a Lawyer queryset to rows matching the given terms.
+
+        `terms` maps a column from SEARCH_COLUMNS (or 'all' for every column)
+        to free text. The returned queryset is annotated with `search_rank`,
+        where lower values are more relevant.
+        """
+        raise NotImplementedError
+
+    def index_lawyer(self, lawyer):
+        """Add or refresh a single lawyer profile in the index"""
+
+    def remove_lawyer(self, lawyer_id):
+        """Drop a lawyer profile from the index"""
+
+    def rebuild(self) -> int:
+        """Rebuild the whole index, returns number of indexed profiles"""
+        return 0
+
+    def ensure_index(self, connection=None):
+        """Create the index structures on `connection` (run after migrate)"""
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """
+    Portable fallback using icontains lookups (no index, works on any database)
+    """
+
+    lookups = {
+        'name': ['user__first_name__icontains', 'user__last_name__icontains'],
+        'specialization': ['specialization__icontains'],
+        'location': ['location__icontains'],
+        'bio': ['bio__icontains'],
+    }
+
+    def filter_queryset(self, queryset, terms):
+        for column, text in terms.items():
+            columns = SEARCH_COLUMNS if column == 'all' else [column]
+            for token in tokenize(text):
+                condition = Q()
+                for name in columns:
+                    for lookup in self.lookups[name]:
+                        condition |= Q(**{lookup: token})
+                queryset = queryset.filter(condition)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    SQLite FTS5 virtual table over lawyer name, specialization, location and bio.
+
+    The table is keyed by the lawyer id (FTS rowid) and joined back to
+    lawyers_lawyer, so filtering, ranking and counting all run in SQL.
+    """
+
+    table_name = 'lawyers_search_fts'
+
+    # bm25 column weights, same order as SEARCH_COLUMNS
+    column_weights = (10.0, 5.0, 5.0, 1.0)
+
+    def _connection(self, write=False):
+        alias = router.db_for_write(Lawyer) if write else router.db_for_read(Lawyer)
+        return connections[alias]
+
+    def ensure_index(self, connection=None):
+        """
+        Create (and populate) the FTS table unless sqlite_master already has it.
+
+        Runs after migrate on the primary and before index writes. Nothing is
+        cached per process, so a rolled back CREATE or a recreated database
+        file is picked up on the next call; searches never run DDL.
+        """
+        connection = connection or self._connection(write=True)
+        if connection.vendor != 'sqlite':
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [self.table_name]
+            )
+            if cursor.fetchone() is not None:
+                return
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {self.table_name} USING fts5("
+                f"{', '.join(SEARCH_COLUMNS)}, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+            self._populate(cursor)
+
+    def _profile_sql(self):
+        user_table = Lawyer._meta.get_field('user').related_model._meta.db_table
+        return (
+            f"SELECT l.id, TRIM(u.first_name || ' ' || u.last_name), "
+            f"l.specialization, l.location, l.bio "
+            f"FROM {Lawyer._meta.db_table} l JOIN {user_table} u ON u.id = l.user_id"
+        )
+
+    def _populate(self, cursor):
+        cursor.execute(
+            f"INSERT INTO {self.table_name}(rowid, {', '.join(SEARCH_COLUMNS)}) "
+            + self._profile_sql()
+        )
+
+    def rebuild(self, connection=None):
+        connection = connection or self._connection(write=True)
+        self.ensure_index(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name}")
+            self._populate(cursor)
+            cursor.execute(f"SELECT COUNT(*) FROM {self.table_name}")
+            return cursor.fetchone()[0]
+
+    def index_lawyer(self, lawyer):
+        connection = self._connection(write=True)
+        self.ensure_index(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE rowid = %s", [lawyer.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table_name}(rowid, {', '.join(SEARCH_COLUMNS)}) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [lawyer.pk, lawyer.user.full_name, lawyer.specialization,
+                 lawyer.location, lawyer.bio]
+            )
+
+    def remove_lawyer(self, lawyer_id):
+        connection = self._connection(write=True)
+        self.ensure_index(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table_name} WHERE rowid = %s", [lawyer_id])
+
+    def build_match_expression(self, terms: Dict[str, str]) -> Optional[str]:
+        """Turn user input into a safe FTS5 MATCH expression (prefix match per token)"""
+        clauses = []
+        for column, text in terms.items():
+            for token in tokenize(text):
+                phrase = '"%s"*' % token.replace('"', '')
+                clauses.append(phrase if column == 'all' else f'{column} : {phrase}')
+        return ' AND '.join(clauses) or None
+
+    def filter_queryset(self, queryset, terms):
+        expression = self.build_match_expression(terms)
+        if expression is None:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        weights = ', '.join(str(weight) for weight in self.column_weights)
+        lawyer_table = Lawyer._meta.db_table
+        # Rank is a real annotation (not an extra select) so it can be
+        # filtered on for keyset pagination
+        return queryset.annotate(
+            search_rank=RawSQL(f'bm25({self.table_name}, {weights})', [], output_field=FloatField())
+        ).extra(
+            tables=[self.table_name],
+            where=[
+                f'{self.table_name}.rowid = {lawyer_table}.id',
+                f'{self.table_name} MATCH %s',
+            ],
+            params=[expression],
+        )
+
+
+_backend = None
+
+
+def get_search_backend() -> BaseSearchBackend:
+    """
+    Return the configured search backend.
+
+    Uses settings.LAWYER_SEARCH_BACKEND (dotted path) when set, otherwise
+    picks FTS5 on SQLite and the portable icontains backend elsewhere.
+    """
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'LAWYER_SEARCH_BACKEND', None)
+        if not backend_path:
+            vendor = connections[router.db_for_read(Lawyer)].vendor
+            backend_path = (
+                'lawyers.search.SQLiteFTS5Backend' if vendor == 'sqlite'
+                else 'lawyers.search.DatabaseSearchBackend'
+            )
+        _backend = import_string(backend_path)()
+    return _backend
+
+
+def create_search_index(sender, using, **kwargs):
+    """post_migrate hook: create the search index on databases Lawyer migrates to"""
+    if router.allow_migrate_model(using, Lawyer):
+        get_search_backend().ensure_index(connections[using])
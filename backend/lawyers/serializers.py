@@ -1,8 +1,30 @@
+from django.db.models import QuerySet
 from rest_framework import serializers
+from judiciary_platform.fieldsets import SparseFieldsetMixin
+from judiciary_platform.metrics import TimedSerializerMixin
 from .models import Lawyer, LawyerVerification, Case
 
 
-class LawyerSerializer(serializers.ModelSerializer):
+class LawyerRowListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    many=True rendering of lawyers from `.values()` rows.
+
+    A Lawyer queryset is turned into one SELECT joining the user table
+    (see LawyerSerializer.row_queryset); rows that already are dicts are
+    rendered as they are. Model instances still take the regular path.
+    """
+    
+    def to_representation(self, data):
+        if isinstance(data, QuerySet) and data.model is Lawyer and data._fields is None:
+            data = self.child.row_queryset(data)
+        return [
+            self.child.row_representation(item) if isinstance(item, dict)
+            else self.child.to_representation(item)
+            for item in data
+        ]
+
+
+class LawyerSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Lawyer model
     """
@@ -12,8 +34,23 @@ class LawyerSerializer(serializers.ModelSerializer):
     won_cases = serializers.ReadOnlyField()
     win_rate = serializers.ReadOnlyField()
     
+    # Columns behind the fields that are not plain Lawyer columns
+    FIELD_COLUMNS = {
+        'full_name': ('user__first_name', 'user__last_name'),
+        'email': ('user__email',),
+        'win_rate': ('won_cases', 'total_cases'),
+    }
+    
+    # Same values as the model paths (User.get_full_name, Lawyer.win_rate)
+    ROW_VALUES = {
+        'full_name': lambda row: f"{row['user__first_name']} {row['user__last_name']}".strip(),
+        'email': lambda row: row['user__email'],
+        'win_rate': lambda row: Lawyer.compute_win_rate(row['won_cases'], row['total_cases']),
+    }
+    
     class Meta:
         model = Lawyer
+        list_serializer_class = LawyerRowListSerializer
         fields = [
             'id', 'full_name', 'email', 'bar_id', 'specialization', 
             'location', 'experience_years', 'is_verified', 'verification_date',
@@ -21,9 +58,28 @@ class LawyerSerializer(serializers.ModelSerializer):
             'total_cases', 'won_cases', 'win_rate', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'is_verified', 'verification_date', 'created_at', 'updated_at']
+    
+    def row_queryset(self, queryset):
+        """
+        `queryset` as dicts of exactly the columns the selected fields need,
+        user columns joined in; annotations (search_rank, ordering keys) are kept
+        """
+        return queryset.values(*self.columns(), *queryset.query.annotations)
+    
+    def row_representation(self, row):
+        """to_representation() for a row_queryset() dict, without model instances"""
+        data = {}
+        for name, field in self.fields.items():
+            value_of = self.ROW_VALUES.get(name)
+            if value_of is not None:
+                data[name] = value_of(row)
+            else:
+                value = row[field.source]
+                data[name] = None if value is None else field.to_representation(value)
+        return data
 
 
-class VerificationSerializer(serializers.ModelSerializer):
+class VerificationSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for LawyerVerification model
     """
@@ -32,6 +88,13 @@ class VerificationSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     reviewed_by_name = serializers.CharField(source='reviewed_by.get_full_name', read_only=True)
     
+    FIELD_COLUMNS = {
+        'lawyer_name': ('lawyer__user__first_name', 'lawyer__user__last_name'),
+        'method_display': ('method',),
+        'status_display': ('status',),
+        'reviewed_by_name': ('reviewed_by__first_name', 'reviewed_by__last_name'),
+    }
+    
     class Meta:
         model = LawyerVerification
         fields = [
@@ -42,7 +105,7 @@ class VerificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class CaseSerializer(serializers.ModelSerializer):
+class CaseSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Case model
     """
@@ -51,6 +114,13 @@ class CaseSerializer(serializers.ModelSerializer):
     outcome_display = serializers.CharField(source='get_outcome_display', read_only=True)
     duration_days = serializers.ReadOnlyField()
     
+    FIELD_COLUMNS = {
+        'lawyer_name': ('lawyer__user__first_name', 'lawyer__user__last_name'),
+        'case_type_display': ('case_type',),
+        'outcome_display': ('outcome',),
+        'duration_days': ('date_filed', 'date_resolved'),
+    }
+    
     class Meta:
         model = Case
         fields = [
@@ -62,7 +132,7 @@ class CaseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class LawyerSearchSerializer(serializers.ModelSerializer):
+class LawyerSearchSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     Simplified serializer for lawyer search results
     """
@@ -70,6 +140,11 @@ class LawyerSearchSerializer(serializers.ModelSerializer):
     win_rate = serializers.ReadOnlyField()
     total_cases = serializers.ReadOnlyField()
     
+    FIELD_COLUMNS = {
+        'full_name': ('user__first_name', 'user__last_name'),
+        'win_rate': ('won_cases', 'total_cases'),
+    }
+    
     class Meta:
         model = Lawyer
         fields = [
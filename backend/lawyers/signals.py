@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from judiciary_platform.caching import invalidate, invalidate_lawyer
+
+from .models import Lawyer, Case, LawyerVerification
+from .search import get_search_backend
+
+
+def _lawyer_user_id(lawyer_id):
+    return Lawyer.objects.filter(pk=lawyer_id).values_list('user_id', flat=True).first()
+
+
+@receiver(pre_save, sender=Case)
+def remember_case_outcome(sender, instance, raw=False, **kwargs):
+    """Capture the stored lawyer/outcome so post_save can move the counters"""
+    instance._previous_counter_state = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._previous_counter_state = Case.objects.filter(
+        pk=instance.pk
+    ).values_list('lawyer_id', 'outcome').first()
+
+
+@receiver(post_save, sender=Case)
+def update_case_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    """Keep Lawyer case counters in sync when a case is created or updated"""
+    if raw:
+        return
+    
+    previous = getattr(instance, '_previous_counter_state', None)
+    current = (instance.lawyer_id, instance.outcome)
+    
+    if created or previous is None:
+        Lawyer.adjust_case_counters(instance.lawyer_id, instance.outcome, 1)
+    elif previous != current:
+        Lawyer.adjust_case_counters(previous[0], previous[1], -1)
+        Lawyer.adjust_case_counters(instance.lawyer_id, instance.outcome, 1)
+    
+    # Counters changed through UPDATE, which sends no Lawyer signals
+    if created or previous != current:
+        invalidate_lawyer(_lawyer_user_id(instance.lawyer_id))
+        if previous is not None and previous[0] != instance.lawyer_id:
+            invalidate_lawyer(_lawyer_user_id(previous[0]))
+    
+    instance._previous_counter_state = current
+
+
+@receiver(post_delete, sender=Case)
+def update_case_counters_on_delete(sender, instance, **kwargs):
+    """Decrement Lawyer case counters when a case is removed"""
+    Lawyer.adjust_case_counters(instance.lawyer_id, instance.outcome, -1)
+    invalidate_lawyer(_lawyer_user_id(instance.lawyer_id))
+
+
+@receiver(post_save, sender=Lawyer)
+def index_lawyer_on_save(sender, instance, raw=False, **kwargs):
+    """Keep the lawyer search index in sync with profile edits"""
+    if raw:
+        return
+    get_search_backend().index_lawyer(instance)
+
+
+@receiver(post_delete, sender=Lawyer)
+def remove_lawyer_from_index(sender, instance, **kwargs):
+    get_search_backend().remove_lawyer(instance.pk)
+
+
+@receiver(post_save, sender=Lawyer)
+@receiver(post_delete, sender=Lawyer)
+def invalidate_lawyer_cache(sender, instance, raw=False, **kwargs):
+    """Drop cached profile, verification status and search pages for the lawyer"""
+    if raw:
+        return
+    invalidate_lawyer(instance.user_id)
+
+
+@receiver(post_save, sender=LawyerVerification)
+@receiver(post_delete, sender=LawyerVerification)
+def invalidate_verification_status_cache(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate('verification_status', _lawyer_user_id(instance.lawyer_id))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_lawyer_on_user_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-index the lawyer profile when the owning user's name changes"""
+    if raw:
+        return
+    # e.g. update_last_login only touches last_login
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    try:
+        lawyer = instance.lawyer_profile
+    except Lawyer.DoesNotExist:
+        return
+    get_search_backend().index_lawyer(lawyer)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_lawyer_cache_on_user_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Lawyer payloads embed the owner's name and email"""
+    if raw:
+        return
+    if update_fields is not None and not {'first_name', 'last_name', 'email'} & set(update_fields):
+        return
+    if Lawyer.objects.filter(user_id=instance.pk).exists():
+        invalidate_lawyer(instance.pk)
@@ -0,0 +1,92 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from .models import Case, Lawyer, LawyerVerification
+
+
+class SparseFieldsetSearchTests(TestCase):
+    """?fields= / ?exclude= on lawyer search, including selections that match nothing"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for index, (first_name, location) in enumerate([('Asha', 'Delhi'), ('Ravi', 'Mumbai'), ('Asha', 'Pune')]):
+            user = CustomUser.objects.create_user(
+                username=f'lawyer{index}', email=f'lawyer{index}@example.com', password='pass-1234',
+                first_name=first_name, last_name='Rao', role='lawyer'
+            )
+            Lawyer.objects.create(
+                user=user, bar_id=f'BAR/{index}/2020', specialization='Criminal Law',
+                location=location, experience_years=index, is_verified=True
+            )
+        cls.user = CustomUser.objects.create_user(username='client', email='client@example.com', password='pass-1234')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get('/api/lawyers/search/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_selected_fields_only(self):
+        results = self.search(fields='id,location', ordering='experience')['lawyers']
+        self.assertEqual([set(row) for row in results], [{'id', 'location'}] * 3)
+
+    def test_unknown_fields_render_every_field(self):
+        for params in (
+            {'fields': 'nonexistent'},
+            {'fields': 'FULL_NAME', 'ordering': 'experience'},
+            {'q': 'asha', 'fields': 'nope'},
+        ):
+            with self.subTest(**params):
+                results = self.search(**params)['lawyers']
+                self.assertTrue(results)
+                for row in results:
+                    self.assertIn('full_name', row)
+                    self.assertIn('experience_years', row)
+
+    def test_excluding_every_field_renders_every_field(self):
+        results = self.search(exclude=','.join(self.search()['lawyers'][0]))['lawyers']
+        self.assertEqual(len(results), 3)
+        self.assertIn('bar_id', results[0])
+
+    def test_cursor_keys_of_unrendered_fields(self):
+        first = self.search(q='asha', fields='id', page_size=1)
+        self.assertEqual(list(first['lawyers'][0]), ['id'])
+        second = self.search(q='asha', fields='id', page_size=1, cursor=first['next_cursor'], ordering=first['ordering'])
+        self.assertNotEqual(first['lawyers'], second['lawyers'])
+
+
+class CaseCounterTests(TestCase):
+    """Profile saves must not write back case counters loaded before a case change"""
+
+    def setUp(self):
+        user = CustomUser.objects.create_user(
+            username='counsel', email='counsel@example.com', password='pass-1234', role='lawyer'
+        )
+        self.lawyer = Lawyer.objects.create(user=user, bar_id='BAR/9/2020', specialization='Civil Law')
+
+    def add_case(self):
+        Case.objects.create(
+            lawyer_id=self.lawyer.pk, title='Case', case_type='civil', outcome='won',
+            date_filed='2020-01-01', court_name='High Court'
+        )
+
+    def test_profile_save_keeps_counters(self):
+        stale = Lawyer.objects.get(pk=self.lawyer.pk)
+        self.add_case()
+        stale.bio = 'Updated'
+        stale.save()
+        self.lawyer.refresh_from_db()
+        self.assertEqual((self.lawyer.bio, self.lawyer.total_cases, self.lawyer.won_cases), ('Updated', 1, 1))
+
+    def test_approval_keeps_counters(self):
+        verification = LawyerVerification.objects.create(
+            lawyer=Lawyer.objects.get(pk=self.lawyer.pk), method='manual', extracted_data={'bar_id': 'BAR/10/2020'}
+        )
+        self.add_case()
+        verification.approve(self.lawyer.user)
+        self.lawyer.refresh_from_db()
+        self.assertEqual((self.lawyer.is_verified, self.lawyer.bar_id, self.lawyer.total_cases), (True, 'BAR/10/2020', 1))
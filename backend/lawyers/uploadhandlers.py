@@ -0,0 +1,37 @@
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class ContentHashMixin:
+    """
+    Compute a SHA-256 of each uploaded file while its chunks stream in.
+
+    The digest is attached to the resulting file as `content_hash`, so services
+    can deduplicate uploads without reading the file a second time.
+    """
+    
+    def new_file(self, *args, **kwargs):
+        # Set up first: the memory handler's new_file raises StopFutureHandlers
+        self.content_hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+    
+    def receive_data_chunk(self, raw_data, start):
+        # Memory handler passes data through untouched when the upload is too large
+        if getattr(self, 'activated', True):
+            self.content_hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file.content_hash = self.content_hasher.hexdigest()
+        return uploaded_file
+
+
+class HashingMemoryFileUploadHandler(ContentHashMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(ContentHashMixin, TemporaryFileUploadHandler):
+    pass
@@ -1,7 +1,10 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.contrib.auth.decorators import user_passes_test
@@ -10,10 +13,16 @@ from django.views.decorators.http import require_http_methods
 from .models import Lawyer, LawyerVerification, Case
 from .services import OCRVerificationService, MockDigiLockerService, ManualVerificationService
 from .serializers import LawyerSerializer, VerificationSerializer, CaseSerializer
+from .search import get_search_backend
+from .pagination import LawyerSearchPagination
+from judiciary_platform.async_views import async_api_view
+from judiciary_platform.caching import cache_response, conditional_get
+from judiciary_platform.throttling import VerificationThrottle
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([VerificationThrottle])
 def verify_lawyer_ocr(request):
     """
     OCR-based lawyer verification endpoint
@@ -33,8 +42,29 @@ def verify_lawyer_ocr(request):
         
         certificate_file = request.FILES['certificate']
         
-        # Process certificate using OCR service
         ocr_service = OCRVerificationService()
+        
+        # Queue for the OCR worker and return straight away
+        if settings.OCR_ASYNC_PROCESSING:
+            result = ocr_service.enqueue_certificate(certificate_file, lawyer)
+            if result['success']:
+                # Cache hits come back already processed
+                processed = result['status'] != 'processing'
+                return Response({
+                    'message': result['message'],
+                    'verification_id': result['verification_id'],
+                    'job_id': result['job_id'],
+                    'status': result['status'],
+                    'extracted_data': result.get('extracted_data'),
+                    'confidence': result.get('confidence'),
+                    'requires_admin_review': True
+                }, status=status.HTTP_200_OK if processed else status.HTTP_202_ACCEPTED)
+            return Response({
+                'error': result['error'],
+                'message': result.get('message', 'Processing failed')
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Process certificate inline using OCR service
         result = ocr_service.process_certificate(certificate_file, lawyer)
         
         if result['success']:
@@ -58,15 +88,19 @@ def verify_lawyer_ocr(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def verify_lawyer_mock_digilocker(request):
+@throttle_classes([VerificationThrottle])
+async def verify_lawyer_mock_digilocker(request):
     """
     Mock DigiLocker verification endpoint for demonstration
+    
+    Async: the DigiLocker round trip is awaited on the event loop instead
+    of blocking a worker thread.
     """
     try:
         # Get or create lawyer profile
-        lawyer, created = Lawyer.objects.get_or_create(
+        lawyer, created = await sync_to_async(Lawyer.objects.get_or_create)(
             user=request.user,
             defaults={'specialization': 'General Practice'}
         )
@@ -83,7 +117,7 @@ def verify_lawyer_mock_digilocker(request):
         
         # Process using mock DigiLocker service
         mock_service = MockDigiLockerService()
-        result = mock_service.simulate_verification(lawyer_data, lawyer)
+        result = await mock_service.averify(lawyer_data, lawyer)
         
         if result['success']:
             return Response({
@@ -93,6 +127,12 @@ def verify_lawyer_mock_digilocker(request):
                 'demo_mode': result['demo_mode'],
                 'requires_admin_review': False  # Auto-approved for demo
             }, status=status.HTTP_200_OK)
+        elif result.get('unavailable'):
+            # Upstream timeout/outage: the client may retry later
+            return Response({
+                'error': result['error'],
+                'message': result.get('message', 'Mock verification failed')
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         else:
             return Response({
                 'error': result['error'],
@@ -108,6 +148,7 @@ def verify_lawyer_mock_digilocker(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([VerificationThrottle])
 def verify_lawyer_manual(request):
     """
     Manual lawyer verification endpoint
@@ -145,8 +186,25 @@ def verify_lawyer_manual(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def lawyer_profile_modified(request):
+    """Last-Modified source for get_lawyer_profile (unique user_id index)"""
+    return Lawyer.objects.filter(user=request.user).values_list('updated_at', flat=True).first()
+
+
+def verification_status_modified(request):
+    """Newest of the profile and its verification attempts, for get_verification_status"""
+    row = Lawyer.objects.filter(user=request.user).annotate(
+        latest_verification=Max('verifications__updated_at')
+    ).values_list('updated_at', 'latest_verification').first()
+    if row is None:
+        return None
+    return max(value for value in row if value is not None)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get('verification_status', verification_status_modified)
+@cache_response('verification_status')
 def get_verification_status(request):
     """
     Get current user's verification status
@@ -165,9 +223,11 @@ def get_verification_status(request):
                 'id': verification.id,
                 'method': verification.get_method_display(),
                 'status': verification.get_status_display(),
+                'status_code': verification.status,
                 'confidence': verification.confidence_score,
                 'created_at': verification.created_at,
                 'admin_comments': verification.admin_comments,
+                'error_message': verification.error_message,
                 'extracted_data': verification.extracted_data
             })
         
@@ -267,13 +327,17 @@ def review_verification(request, verification_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get('lawyer_profile', lawyer_profile_modified)
+@cache_response('lawyer_profile')
 def get_lawyer_profile(request):
     """
     Get current user's lawyer profile
     """
     try:
-        lawyer = get_object_or_404(Lawyer, user=request.user)
-        serializer = LawyerSerializer(lawyer)
+        # ?fields= / ?exclude= also narrow the columns loaded
+        serializer = LawyerSerializer(context={'request': request})
+        lawyer = get_object_or_404(serializer.project(Lawyer.objects.all()), user=request.user)
+        serializer.instance = lawyer
         return Response(serializer.data, status=status.HTTP_200_OK)
     except Lawyer.DoesNotExist:
         return Response({
@@ -304,11 +368,17 @@ def update_lawyer_profile(request):
 
 
 @api_view(['GET'])
+@cache_response('lawyer_search', per_user=False)
 def search_lawyers(request):
     """
     Search for verified lawyers with filters
+    
+    Paginated by cursor: pass back `next_cursor` as `?cursor=` with the same
+    filters and `ordering`. Add `?include_total=true` for an approximate count
+    and `?fields=` / `?exclude=` (comma-separated) to trim each result.
     """
     # Get query parameters
+    query = request.GET.get('q', '')
     name = request.GET.get('name', '')
     specialization = request.GET.get('specialization', '')
     location = request.GET.get('location', '')
@@ -317,22 +387,31 @@ def search_lawyers(request):
     # Build query
     lawyers = Lawyer.objects.filter(is_verified=True)
     
-    if name:
-        lawyers = lawyers.filter(user__first_name__icontains=name) | lawyers.filter(user__last_name__icontains=name)
+    if min_experience:
+        lawyers = lawyers.filter(experience_years__gte=int(min_experience))
     
-    if specialization:
-        lawyers = lawyers.filter(specialization__icontains=specialization)
+    # Text terms go through the search index, ranked by relevance
+    terms = {
+        column: value for column, value in (
+            ('all', query),
+            ('name', name),
+            ('specialization', specialization),
+            ('location', location),
+        ) if value
+    }
+    lawyers = get_search_backend().filter_queryset(lawyers, terms)
     
-    if location:
-        lawyers = lawyers.filter(location__icontains=location)
+    # Rows as dicts with the user columns joined in: one SELECT per page,
+    # reading only the columns of the fields selected by ?fields= / ?exclude=
+    lawyers = LawyerSerializer(context={'request': request}).row_queryset(lawyers)
     
-    if min_experience:
-        lawyers = lawyers.filter(experience_years__gte=int(min_experience))
+    # Keyset pagination: stable (sort key, id) cursor, opt-in approximate total
+    paginator = LawyerSearchPagination()
+    page = paginator.paginate_queryset(
+        lawyers, request, default_ordering='relevance' if terms else None
+    )
     
     # Serialize results
-    serializer = LawyerSerializer(lawyers, many=True)
+    serializer = LawyerSerializer(page, many=True, context={'request': request})
     
-    return Response({
-        'lawyers': serializer.data,
-        'total_count': lawyers.count()
-    }, status=status.HTTP_200_OK)
\ No newline at end of file
+    return paginator.get_paginated_response(serializer.data)